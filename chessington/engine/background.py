@@ -0,0 +1,97 @@
+"""
+Searches run on a background thread, for callers such as the GUI that must keep handling events
+while the engine thinks.
+
+The search runs on a copy of the position, so the caller's board can still be read while it runs.
+Progress is posted to a queue as each iteration completes, and the caller collects it with poll
+whenever it suits, for example on an event loop timeout.
+"""
+
+import queue
+import threading
+from collections import namedtuple
+
+from chessington.engine.search import Searcher
+
+SearchEvent = namedtuple('SearchEvent', 'result finished')
+
+
+class BackgroundSearch:
+    """
+    Runs one search at a time on a background thread with the given Searcher, or a new one.
+    """
+
+    def __init__(self, searcher=None):
+        self.searcher = searcher if searcher is not None else Searcher()
+        self.cancelled = False
+        self._events = queue.Queue()
+        self._thread = None
+        self._stop_event = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, board, depth=None, time_limit=None, node_limit=None, processes=1):
+        """
+        Starts searching the board's position; see Searcher.search for the limits. A SearchEvent is
+        posted for each completed iteration, then one with finished set for the final result.
+        """
+        if self.running:
+            raise RuntimeError('A search is already running')
+        self.cancelled = False
+        self.poll()
+        position = type(board).from_fen(board.to_fen())
+        stop_event = self._stop_event = threading.Event()
+
+        def info(result):
+            self._events.put(SearchEvent(result, False))
+
+        def run():
+            result = self.searcher.search(position, depth, time_limit, node_limit, info, processes, stop_event)
+            self._events.put(SearchEvent(result, True))
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Asks the search to finish as soon as possible with the best move found so far. Does nothing
+        if no search is running.
+        """
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    def cancel(self):
+        """
+        Stops the search and marks its result as unwanted.
+        """
+        self.cancelled = True
+        self.stop()
+
+    def close(self):
+        """
+        Cancels any running search, waits for it to finish and closes the Searcher.
+        """
+        self.cancel()
+        self.wait()
+        self.searcher.close()
+
+    def poll(self):
+        """
+        Returns the SearchEvents posted since the last poll, without waiting.
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def wait(self, timeout=None):
+        """
+        Waits for the search to finish, returning whether it has.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.running
@@ -0,0 +1,67 @@
+"""
+Analysis of many independent positions in parallel across a pool of worker processes.
+
+Positions are packed with the encoding module and sent to the workers in chunks. Each worker keeps
+one long-lived Searcher, and so one transposition table, for its whole lifetime. Results are
+streamed back as they arrive, with only a bounded number of chunks in flight at once, so arbitrarily
+long position streams are analysed in constant memory.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from chessington.engine.board import Board
+from chessington.engine.encoding import encode_positions, decode_positions, encode_move, decode_move
+from chessington.engine.pool import map_bounded
+from chessington.engine.search import Searcher
+
+AnalysisResult = namedtuple('AnalysisResult', 'index move score depth nodes')
+
+_worker_searcher = None
+
+
+def _initialise_worker(megabytes):
+    global _worker_searcher
+    _worker_searcher = Searcher(megabytes=megabytes)
+
+
+def _analyse_chunk(start_index, data, board_class, depth, time_limit, node_limit):
+    results = []
+    for offset, board in enumerate(decode_positions(data, board_class)):
+        result = _worker_searcher.search(board, depth, time_limit, node_limit)
+        results.append((start_index + offset, encode_move(result.move), result.score, result.depth, result.nodes))
+    return results
+
+
+def _unpack(results):
+    return [AnalysisResult(index, decode_move(move_code), score, depth, nodes)
+            for index, move_code, score, depth, nodes in results]
+
+
+def analyse_batch(positions, depth=None, time_limit=None, node_limit=None, processes=None, chunk_size=16,
+                  ordered=True, megabytes=16, board_class=Board):
+    """
+    Searches each of the given boards, limited by depth, time per position in seconds or nodes per
+    position, across the given number of worker processes (by default one per CPU). Yields an
+    AnalysisResult for each position, in the order given if ordered is true or else as soon as
+    each chunk completes; each result's index is the position's place in the input.
+    """
+    if depth is None and time_limit is None and node_limit is None:
+        raise ValueError('A depth, time or node limit is needed to analyse a batch')
+    processes = processes or os.cpu_count() or 1
+    positions = iter(positions)
+
+    def chunks():
+        start_index = 0
+        while True:
+            chunk = list(islice(positions, chunk_size))
+            if not chunk:
+                return
+            yield start_index, encode_positions(chunk), board_class, depth, time_limit, node_limit
+            start_index += len(chunk)
+
+    with ProcessPoolExecutor(processes, initializer=_initialise_worker, initargs=(megabytes,)) as executor:
+        for results in map_bounded(executor, _analyse_chunk, chunks(), processes, ordered):
+            yield from _unpack(results)
@@ -0,0 +1,369 @@
+"""
+A bitboard-backed variant of the chess board. Each (player, piece type) pair has a 64-bit occupancy
+mask, alongside combined masks per player and for the whole board, so that occupancy tests are
+integer bit operations rather than lookups into the nested list of pieces.
+
+Moves are generated from the same masks. The attack tables and ray masks give each piece's
+destinations, less the squares of its own side's pieces, and legality is settled with masks too:
+pinned pieces are kept to the line of their pin, moves made in check must capture or block the
+checking piece, and king moves must not land on an attacked square. Only en passant captures are
+tried on the board.
+
+Bit ``row * 8 + col`` of a mask corresponds to the square at (row, col).
+"""
+
+from chessington.engine.board import Board, BOARD_SIZE, PIECE_TYPES, PROMOTION_TYPES
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine.tables import (KNIGHT_ATTACKS, KING_ATTACKS, WHITE_PAWN_ATTACKS, BLACK_PAWN_ATTACKS,
+                                       ROOK_RAY_MASKS, BISHOP_RAY_MASKS)
+
+MASK_INDEX = {
+    player: {piece_type: offset * len(PIECE_TYPES) + i for i, piece_type in enumerate(PIECE_TYPES)}
+    for offset, player in enumerate(Player)
+}
+
+# The same indexes split into a per-type part and a per-player offset. The offset is found by
+# comparing the player by identity, since hashing an enum member is slow on the make and unmake path.
+_TYPE_INDEX = {piece_type: i for i, piece_type in enumerate(PIECE_TYPES)}
+_PAWN, _KNIGHT, _BISHOP, _ROOK, _QUEEN, _KING = (_TYPE_INDEX[piece_type] for piece_type in PIECE_TYPES)
+
+_ALL_SQUARES = (1 << BOARD_SIZE * BOARD_SIZE) - 1
+# The first and last rows, which a pawn promotes on reaching.
+_PROMOTION_ROWS = 0xFF | 0xFF << 56
+
+
+def square_bit(square):
+    """
+    The single-bit mask for the given square.
+    """
+    return 1 << (square.row * BOARD_SIZE + square.col)
+
+
+def mask_squares(mask):
+    """
+    The squares of the bits set in the given mask, in increasing order of index.
+    """
+    squares = []
+    while mask:
+        bit = mask & -mask
+        squares.append(Square.from_index(bit.bit_length() - 1))
+        mask ^= bit
+    return squares
+
+
+class BitBoard(Board):
+    """
+    A board that mirrors its pieces into occupancy bitmasks. It behaves exactly like Board, and can
+    be created in the same way with BitBoard.empty() or BitBoard.at_starting_position().
+    """
+
+    def __init__(self, player, board_state, castling_rights=0, en_passant_file=None):
+        self.piece_masks = [0] * (len(PIECE_TYPES) * len(Player))
+        self.side_masks = [0, 0]
+        self.occupied = 0
+        super().__init__(player, board_state, castling_rights, en_passant_file)
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                piece = board_state[row][col]
+                if piece is not None:
+                    self._set_bits(piece, 1 << (row * BOARD_SIZE + col))
+
+    @property
+    def player_masks(self):
+        """
+        The occupancy masks of each player's pieces, by player.
+        """
+        return {player: self.side_masks[_side(player)] for player in Player}
+
+    def set_piece(self, square, piece):
+        """
+        Places the piece at the given position on the board, keeping the masks up to date.
+        """
+        bit = 1 << (square.row * BOARD_SIZE + square.col)
+        current = self.board[square.row][square.col]
+        if current is not None:
+            self._clear_bits(current, bit)
+        super().set_piece(square, piece)
+        if piece is not None:
+            self._set_bits(piece, bit)
+
+    def pieces_mask(self, player, piece_type):
+        """
+        The occupancy mask of the given player's pieces of the given type.
+        """
+        return self.piece_masks[MASK_INDEX[player][piece_type]]
+
+    def is_attacked(self, square, by_player):
+        """
+        Whether any piece of the given player attacks the given square, tested against the attack
+        tables and ray masks with bit operations.
+        """
+        return self._attacked(square.row * BOARD_SIZE + square.col, _side(by_player), self.occupied)
+
+    def pseudo_legal_moves(self):
+        """
+        All moves the pieces of the current player can make, ignoring whether they leave the king in
+        check.
+        """
+        moves = []
+        for type_index, from_square, targets in self._piece_targets(_side(self.current_player)):
+            self._add_target_moves(moves, type_index, from_square, targets)
+        return moves
+
+    def legal_moves(self):
+        """
+        All moves the current player can make that do not leave their own king in check.
+        """
+        side = _side(self.current_player)
+        kings = self.piece_masks[side * len(PIECE_TYPES) + _KING]
+        if not kings:
+            return self.pseudo_legal_moves()
+        king_index = kings.bit_length() - 1
+        evasions = self._evasion_mask(king_index, side)
+        pins = self._pin_rays(king_index, side)
+        en_passant = self._en_passant_bit(side)
+        occupied_without_king = self.occupied ^ kings
+
+        moves = []
+        for type_index, from_square, targets in self._piece_targets(side):
+            if type_index == _KING:
+                safe = 0
+                while targets:
+                    bit = targets & -targets
+                    targets ^= bit
+                    if not self._attacked(bit.bit_length() - 1, 1 - side, occupied_without_king):
+                        safe |= bit
+                self._add_target_moves(moves, _KING, from_square, safe)
+                continue
+            if type_index == _PAWN and targets & en_passant:
+                self._add_verified_moves(moves, from_square, en_passant)
+                targets ^= en_passant
+            targets &= evasions & pins.get(square_bit(from_square), _ALL_SQUARES)
+            self._add_target_moves(moves, type_index, from_square, targets)
+        return moves
+
+    def pinned_pieces(self, player):
+        """
+        The set of the given player's pieces that are pinned to their king.
+        """
+        kings = self.piece_masks[_side(player) * len(PIECE_TYPES) + _KING]
+        if not kings:
+            return set()
+        pins = self._pin_rays(kings.bit_length() - 1, _side(player))
+        return {self.get_piece(Square.from_index(bit.bit_length() - 1)) for bit in pins}
+
+    def _pin_rays(self, king_index, side):
+        """
+        A map from the bit of each of the side's pinned pieces to the mask of the squares it can
+        still move to: those between its king and the pinning piece, and the pinning piece itself.
+        """
+        masks = self.piece_masks
+        offset = (1 - side) * len(PIECE_TYPES)
+        queens = masks[offset + _QUEEN]
+        own = self.side_masks[side]
+        occupied = self.occupied
+        pins = {}
+        for ray_masks, sliders in ((ROOK_RAY_MASKS[king_index], masks[offset + _ROOK] | queens),
+                                   (BISHOP_RAY_MASKS[king_index], masks[offset + _BISHOP] | queens)):
+            if not sliders:
+                continue
+            for ray_mask, increasing in ray_masks:
+                blockers = ray_mask & occupied
+                if not blockers:
+                    continue
+                nearest = _nearest(blockers, increasing)
+                beyond = blockers ^ nearest
+                if nearest & own and beyond:
+                    pinner = _nearest(beyond, increasing)
+                    if pinner & sliders:
+                        pins[nearest] = _ray_to(ray_mask, pinner, increasing)
+        return pins
+
+    def _evasion_mask(self, king_index, side):
+        """
+        The squares a piece other than the king must move to while the side is in check: the
+        checking piece and the squares between it and the king. Every square if the side is not in
+        check, and none if it is in double check.
+        """
+        masks = self.piece_masks
+        offset = (1 - side) * len(PIECE_TYPES)
+        pawn_attacks = BLACK_PAWN_ATTACKS if side else WHITE_PAWN_ATTACKS
+        checkers = (KNIGHT_ATTACKS[king_index] & masks[offset + _KNIGHT] |
+                    pawn_attacks[king_index] & masks[offset + _PAWN])
+        evasions = checkers
+        count = 1 if checkers else 0
+        queens = masks[offset + _QUEEN]
+        occupied = self.occupied
+        for ray_masks, sliders in ((ROOK_RAY_MASKS[king_index], masks[offset + _ROOK] | queens),
+                                   (BISHOP_RAY_MASKS[king_index], masks[offset + _BISHOP] | queens)):
+            if not sliders:
+                continue
+            for ray_mask, increasing in ray_masks:
+                blockers = ray_mask & occupied
+                if blockers:
+                    nearest = _nearest(blockers, increasing)
+                    if nearest & sliders:
+                        evasions |= _ray_to(ray_mask, nearest, increasing)
+                        count += 1
+        if not count:
+            return _ALL_SQUARES
+        return evasions if count == 1 else 0
+
+    def _piece_targets(self, side):
+        """
+        Yields a (type index, square, target mask) triple for each of the side's pieces, where the
+        target mask holds the squares the piece can move to, ignoring checks.
+        """
+        masks = self.piece_masks
+        offset = side * len(PIECE_TYPES)
+        not_own = ~self.side_masks[side]
+        for type_index in range(len(PIECE_TYPES)):
+            pieces = masks[offset + type_index]
+            while pieces:
+                bit = pieces & -pieces
+                pieces ^= bit
+                index = bit.bit_length() - 1
+                from_square = Square.from_index(index)
+                if type_index == _PAWN:
+                    targets = self._pawn_targets(side, index)
+                elif type_index == _KNIGHT:
+                    targets = KNIGHT_ATTACKS[index] & not_own
+                elif type_index == _BISHOP:
+                    targets = self._slider_targets(BISHOP_RAY_MASKS[index]) & not_own
+                elif type_index == _ROOK:
+                    targets = self._slider_targets(ROOK_RAY_MASKS[index]) & not_own
+                elif type_index == _QUEEN:
+                    targets = (self._slider_targets(ROOK_RAY_MASKS[index]) |
+                               self._slider_targets(BISHOP_RAY_MASKS[index])) & not_own
+                else:
+                    targets = KING_ATTACKS[index] & not_own
+                    if self.castling_rights:
+                        for square in self.get_piece(from_square).castling_moves(self, from_square):
+                            targets |= square_bit(square)
+                yield type_index, from_square, targets
+
+    def _pawn_targets(self, side, index):
+        """
+        The squares a pawn on the given square can move to: one or two squares forwards onto empty
+        squares, diagonally onto enemy pieces, and onto the en passant square.
+        """
+        empty = ~self.occupied & _ALL_SQUARES
+        unmoved = not self.board[index // BOARD_SIZE][index % BOARD_SIZE].moved
+        if side:
+            targets = 1 << index >> BOARD_SIZE & empty
+            if targets and unmoved:
+                targets |= targets >> BOARD_SIZE & empty
+            attacks = BLACK_PAWN_ATTACKS[index]
+        else:
+            targets = 1 << index << BOARD_SIZE & empty
+            if targets and unmoved:
+                targets |= targets << BOARD_SIZE & empty
+            attacks = WHITE_PAWN_ATTACKS[index]
+        return targets | attacks & (self.side_masks[1 - side] | self._en_passant_bit(side))
+
+    def _en_passant_bit(self, side):
+        """
+        The mask of the square the side's pawns can capture en passant onto, or 0 if there is none.
+        """
+        if self.en_passant_file is None:
+            return 0
+        return 1 << ((2 if side else 5) * BOARD_SIZE + self.en_passant_file)
+
+    def _slider_targets(self, ray_masks):
+        """
+        The squares a slider reaches along the given rays: each ray up to and including its nearest
+        piece.
+        """
+        targets = 0
+        occupied = self.occupied
+        for ray_mask, increasing in ray_masks:
+            blockers = ray_mask & occupied
+            targets |= _ray_to(ray_mask, _nearest(blockers, increasing), increasing) if blockers else ray_mask
+        return targets
+
+    @staticmethod
+    def _add_target_moves(moves, type_index, from_square, targets):
+        # A pawn's targets are all on the row ahead of it, so either all or none of them promote.
+        if type_index == _PAWN and targets & _PROMOTION_ROWS:
+            moves.extend(Move(from_square, to_square, promotion)
+                         for to_square in mask_squares(targets) for promotion in PROMOTION_TYPES)
+        else:
+            moves.extend(Move(from_square, to_square) for to_square in mask_squares(targets))
+
+    def _add_verified_moves(self, moves, from_square, targets):
+        """
+        Tries the moves to the given targets on the board, adding those that do not leave the king
+        in check.
+        """
+        player = self.current_player
+        piece = self.get_piece(from_square)
+        for to_square in mask_squares(targets):
+            self.make_move(Move(from_square, to_square))
+            leaves_check = self.in_check(player)
+            self.unmake_move()
+            if not leaves_check:
+                self._add_moves(moves, piece, from_square, to_square)
+
+    def _attacked(self, index, by_side, occupied):
+        """
+        Whether any piece of the given side attacks the square with the given index, with the
+        squares in the given mask blocking sliders.
+        """
+        masks = self.piece_masks
+        offset = by_side * len(PIECE_TYPES)
+        if KNIGHT_ATTACKS[index] & masks[offset + _KNIGHT] or KING_ATTACKS[index] & masks[offset + _KING]:
+            return True
+        pawn_attacks = WHITE_PAWN_ATTACKS if by_side else BLACK_PAWN_ATTACKS
+        if pawn_attacks[index] & masks[offset + _PAWN]:
+            return True
+        queens = masks[offset + _QUEEN]
+        return (_slider_attacks_mask(ROOK_RAY_MASKS[index], masks[offset + _ROOK] | queens, occupied) or
+                _slider_attacks_mask(BISHOP_RAY_MASKS[index], masks[offset + _BISHOP] | queens, occupied))
+
+    def emptySquare(self, square):
+        return not self.occupied >> (square.row * BOARD_SIZE + square.col) & 1
+
+    def fullSquare(self, square):
+        return bool(self.occupied >> (square.row * BOARD_SIZE + square.col) & 1)
+
+    def _set_bits(self, piece, bit):
+        side = _side(piece.player)
+        self.piece_masks[side * len(PIECE_TYPES) + _TYPE_INDEX[type(piece)]] |= bit
+        self.side_masks[side] |= bit
+        self.occupied |= bit
+
+    def _clear_bits(self, piece, bit):
+        side = _side(piece.player)
+        self.piece_masks[side * len(PIECE_TYPES) + _TYPE_INDEX[type(piece)]] &= ~bit
+        self.side_masks[side] &= ~bit
+        self.occupied &= ~bit
+
+
+def _side(player):
+    return 1 if player is Player.BLACK else 0
+
+
+def _nearest(blockers, increasing):
+    """
+    The bit of the nearest piece along a ray from the pieces on it: the lowest set bit for a ray
+    running towards higher indices, else the highest.
+    """
+    return blockers & -blockers if increasing else 1 << (blockers.bit_length() - 1)
+
+
+def _ray_to(ray_mask, bit, increasing):
+    """
+    The part of the ray up to and including the given bit.
+    """
+    return ray_mask & ((bit << 1) - 1 if increasing else -bit)
+
+
+def _slider_attacks_mask(ray_masks, sliders, occupied):
+    if not sliders:
+        return False
+    for ray_mask, increasing in ray_masks:
+        blockers = ray_mask & occupied
+        if blockers and _nearest(blockers, increasing) & sliders:
+            return True
+    return False
@@ -1,32 +1,175 @@
 """
-A module providing a representation of a chess board. The rules of chess are not implemented - 
-this is just a "dumb" board that will let you move pieces around as you like.
+A module providing a representation of a chess board, along with the game state needed to apply the
+rules of chess: the side to move, castling rights, the en passant file and the move clocks.
 """
 
 from collections import namedtuple
 from enum import Enum, auto
 
-from chessington.engine.data import Player, Square
+from chessington.engine.data import (BOARD_SIZE, Player, Square, Move, FILE_NAMES, WHITE_KINGSIDE, WHITE_QUEENSIDE,
+                                     BLACK_KINGSIDE, BLACK_QUEENSIDE, ALL_CASTLING_RIGHTS)
+from chessington.engine.evaluation import SQUARE_SCORES, compute_score
 from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine.tables import (KNIGHT_MOVES, KING_MOVES, WHITE_PAWN_CAPTURES, BLACK_PAWN_CAPTURES, ROOK_RAYS,
+                                       BISHOP_RAYS)
+from chessington.engine.zobrist import PIECE_KEYS, BLACK_TO_MOVE_KEY, CASTLING_KEYS, EN_PASSANT_KEYS, compute_key
 
-BOARD_SIZE = 8
+PIECE_TYPES = (Pawn, Knight, Bishop, Rook, Queen, King)
+
+FEN_LETTERS = {Pawn: 'p', Knight: 'n', Bishop: 'b', Rook: 'r', Queen: 'q', King: 'k'}
+STARTING_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+PROMOTION_TYPES = (Queen, Rook, Bishop, Knight)
+
+PAWN_START_ROWS = {Player.WHITE: 1, Player.BLACK: BOARD_SIZE - 2}
+
+CASTLING_LETTERS = ((WHITE_KINGSIDE, 'K'), (WHITE_QUEENSIDE, 'Q'), (BLACK_KINGSIDE, 'k'), (BLACK_QUEENSIDE, 'q'))
+
+
+def _castling_masks():
+    masks = [ALL_CASTLING_RIGHTS] * (BOARD_SIZE * BOARD_SIZE)
+    for index, lost_rights in ((0, WHITE_QUEENSIDE), (4, WHITE_KINGSIDE | WHITE_QUEENSIDE), (7, WHITE_KINGSIDE),
+                               (56, BLACK_QUEENSIDE), (60, BLACK_KINGSIDE | BLACK_QUEENSIDE), (63, BLACK_KINGSIDE)):
+        masks[index] = ALL_CASTLING_RIGHTS & ~lost_rights
+    return tuple(masks)
+
+
+# The castling rights that survive a move from or to each square: moving a king or rook, or capturing
+# a rook, loses the rights that depend on it.
+CASTLING_MASKS = _castling_masks()
+
+# For each castling king destination, the rook's starting and finishing squares.
+CASTLING_ROOK_MOVES = {
+    Square.at(row, king_col): (Square.at(row, rook_from), Square.at(row, rook_to))
+    for row in (0, BOARD_SIZE - 1) for king_col, rook_from, rook_to in ((6, 7, 5), (2, 0, 3))
+}
 
 class Board:
     """
-    A representation of the chess board, and the pieces on it.
+    A representation of the chess board, and the pieces on it. Pawns placed away from their starting
+    rank are marked as having moved, so boards built from any position description handle double
+    pawn moves correctly.
     """
 
-    def __init__(self, player, board_state):
-        self.current_player = Player.WHITE
+    def __init__(self, player, board_state, castling_rights=0, en_passant_file=None):
+        self.current_player = player
         self.board = board_state
+        self.castling_rights = castling_rights
+        self.en_passant_file = en_passant_file
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self._undo_stack = []
+        self._locations = {}
+        self._piece_lists = {p: {piece_type: [] for piece_type in PIECE_TYPES} for p in Player}
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                piece = board_state[row][col]
+                if piece is not None:
+                    if type(piece) is Pawn and row != PAWN_START_ROWS[piece.player]:
+                        piece.moved = True
+                    self._add_to_index(piece, Square.at(row, col))
+        self.zobrist_key = compute_key(self)
+        self.evaluation_score = compute_score(self)
 
-    @staticmethod
-    def empty():
-        return Board(Player.WHITE, Board._create_empty_board())
+    @classmethod
+    def empty(cls):
+        return cls(Player.WHITE, cls._create_empty_board())
+
+    @classmethod
+    def at_starting_position(cls):
+        return cls(Player.WHITE, cls._create_starting_board(), ALL_CASTLING_RIGHTS)
+
+    @classmethod
+    def from_fen(cls, fen):
+        """
+        Creates a board from a position in Forsyth-Edwards Notation. An en passant square is only kept
+        if a pawn can capture on it.
+        """
+        fields = fen.split()
+        if len(fields) not in (4, 6):
+            raise ValueError('Invalid FEN: {}'.format(fen))
+        ranks = fields[0].split('/')
+        if len(ranks) != BOARD_SIZE:
+            raise ValueError('Invalid FEN: {}'.format(fen))
+
+        piece_types = {letter: piece_type for piece_type, letter in FEN_LETTERS.items()}
+        board_state = cls._create_empty_board()
+        for rank, rank_text in enumerate(ranks):
+            row, col = BOARD_SIZE - 1 - rank, 0
+            for char in rank_text:
+                if char.isdigit():
+                    col += int(char)
+                elif char.lower() in piece_types and col < BOARD_SIZE:
+                    player = Player.WHITE if char.isupper() else Player.BLACK
+                    board_state[row][col] = piece_types[char.lower()](player)
+                    col += 1
+                else:
+                    raise ValueError('Invalid FEN: {}'.format(fen))
+            if col != BOARD_SIZE:
+                raise ValueError('Invalid FEN: {}'.format(fen))
+
+        if fields[1] not in ('w', 'b'):
+            raise ValueError('Invalid FEN: {}'.format(fen))
+        player = Player.WHITE if fields[1] == 'w' else Player.BLACK
+
+        castling_rights = 0
+        if fields[2] != '-':
+            letters = dict((letter, right) for right, letter in CASTLING_LETTERS)
+            for char in fields[2]:
+                if char not in letters:
+                    raise ValueError('Invalid FEN: {}'.format(fen))
+                castling_rights |= letters[char]
+
+        en_passant_file = None
+        if fields[3] != '-':
+            en_passant_file = Square.from_name(fields[3]).col
+            if not cls._pawn_beside(board_state, player.opponent(), en_passant_file):
+                en_passant_file = None
+
+        board = cls(player, board_state, castling_rights, en_passant_file)
+        if len(fields) == 6:
+            board.halfmove_clock = int(fields[4])
+            board.fullmove_number = int(fields[5])
+        return board
+
+    def to_fen(self):
+        """
+        Describes the position in Forsyth-Edwards Notation.
+        """
+        ranks = []
+        for row in range(BOARD_SIZE - 1, -1, -1):
+            rank_text, empty = '', 0
+            for piece in self.board[row]:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank_text, empty = rank_text + str(empty), 0
+                letter = FEN_LETTERS[type(piece)]
+                rank_text += letter.upper() if piece.player == Player.WHITE else letter
+            ranks.append(rank_text + (str(empty) if empty else ''))
+        side = 'w' if self.current_player == Player.WHITE else 'b'
+        castling = ''.join(letter for right, letter in CASTLING_LETTERS if self.castling_rights & right) or '-'
+        if self.en_passant_file is None:
+            en_passant = '-'
+        else:
+            en_passant = FILE_NAMES[self.en_passant_file] + ('6' if self.current_player == Player.WHITE else '3')
+        return '{} {} {} {} {} {}'.format('/'.join(ranks), side, castling, en_passant, self.halfmove_clock,
+                                          self.fullmove_number)
 
     @staticmethod
-    def at_starting_position():
-        return Board(Player.WHITE, Board._create_starting_board())
+    def _pawn_beside(board_state, player, col):
+        """
+        Whether a pawn of the opponent of the given player could capture en passant a pawn of the
+        given player that has just moved two squares to the given file.
+        """
+        row = 3 if player == Player.WHITE else 4
+        for capturing_col in (col - 1, col + 1):
+            if 0 <= capturing_col < BOARD_SIZE:
+                piece = board_state[row][capturing_col]
+                if type(piece) is Pawn and piece.player != player:
+                    return True
+        return False
 
     @staticmethod
     def _create_empty_board():
@@ -53,7 +196,22 @@ class Board:
         """
         Places the piece at the given position on the board.
         """
-        self.board[square.row][square.col] = piece
+        row = self.board[square.row]
+        current = row[square.col]
+        index = square.row * BOARD_SIZE + square.col
+        if current is not None:
+            self.zobrist_key ^= PIECE_KEYS[current.player][type(current)][index]
+            self.evaluation_score -= SQUARE_SCORES[current.player][type(current)][index]
+            if self._locations.get(current) == square:
+                self._remove_from_index(current)
+        row[square.col] = piece
+        if piece is not None:
+            self.zobrist_key ^= PIECE_KEYS[piece.player][type(piece)][index]
+            self.evaluation_score += SQUARE_SCORES[piece.player][type(piece)][index]
+            if piece in self._locations:
+                self._locations[piece] = square
+            else:
+                self._add_to_index(piece, square)
 
     def get_piece(self, square):
         """
@@ -65,11 +223,33 @@ class Board:
         """
         Searches for the given piece on the board and returns its square.
         """
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                if self.board[row][col] is piece_to_find:
-                    return Square.at(row, col)
-        raise Exception('The supplied piece is not on the board')
+        square = self._locations.get(piece_to_find)
+        if square is None:
+            raise Exception('The supplied piece is not on the board')
+        return square
+
+    def pieces(self, player, piece_type=None):
+        """
+        Returns the pieces belonging to the given player, optionally restricted to a single type.
+        """
+        piece_lists = self._piece_lists[player]
+        if piece_type is not None:
+            return list(piece_lists[piece_type])
+        return [piece for piece_type in PIECE_TYPES for piece in piece_lists[piece_type]]
+
+    def piece_count(self):
+        """
+        The number of pieces on the board, of both players.
+        """
+        return len(self._locations)
+
+    def _add_to_index(self, piece, square):
+        self._locations[piece] = square
+        self._piece_lists[piece.player][type(piece)].append(piece)
+
+    def _remove_from_index(self, piece):
+        del self._locations[piece]
+        self._piece_lists[piece.player][type(piece)].remove(piece)
 
     def move_piece(self, from_square, to_square):
         """
@@ -77,9 +257,216 @@ class Board:
         """
         moving_piece = self.get_piece(from_square)
         if moving_piece is not None and moving_piece.player == self.current_player:
-            self.set_piece(to_square, moving_piece)
-            self.set_piece(from_square, None)
-            self.current_player = self.current_player.opponent()
+            self.make_move(Move(from_square, to_square))
+
+    def make_move(self, move):
+        """
+        Makes the given move in place, without checking that it is allowed, recording what is needed
+        to take it back again with unmake_move. Castling (a king moving two squares), en passant and
+        promotion are carried out in full.
+        """
+        from_square, to_square = move.from_square, move.to_square
+        moving_piece = self.get_piece(from_square)
+        player = moving_piece.player
+        is_pawn = type(moving_piece) is Pawn
+
+        captured_square = to_square
+        captured_piece = self.get_piece(to_square)
+        if is_pawn and captured_piece is None and from_square.col != to_square.col:
+            captured_square = Square.at(from_square.row, to_square.col)
+            captured_piece = self.get_piece(captured_square)
+
+        self._undo_stack.append((move, moving_piece, captured_piece, captured_square, moving_piece.moved,
+                                 self.current_player, self.halfmove_clock, self.castling_rights,
+                                 self.en_passant_file, self.zobrist_key))
+
+        if captured_square is not to_square:
+            self.set_piece(captured_square, None)
+        placed_piece = moving_piece
+        if is_pawn and (to_square.row == 0 or to_square.row == BOARD_SIZE - 1):
+            placed_piece = (move.promotion or Queen)(player)
+            placed_piece.moved = True
+        self.set_piece(to_square, placed_piece)
+        self.set_piece(from_square, None)
+        moving_piece.moved = True
+
+        if type(moving_piece) is King and abs(to_square.col - from_square.col) == 2:
+            rook_from, rook_to = CASTLING_ROOK_MOVES[to_square]
+            self.set_piece(rook_to, self.get_piece(rook_from))
+            self.set_piece(rook_from, None)
+
+        castling_rights = (self.castling_rights & CASTLING_MASKS[from_square.row * BOARD_SIZE + from_square.col] &
+                           CASTLING_MASKS[to_square.row * BOARD_SIZE + to_square.col])
+        if castling_rights != self.castling_rights:
+            self.zobrist_key ^= CASTLING_KEYS[self.castling_rights] ^ CASTLING_KEYS[castling_rights]
+            self.castling_rights = castling_rights
+
+        if self.en_passant_file is not None:
+            self.zobrist_key ^= EN_PASSANT_KEYS[self.en_passant_file]
+            self.en_passant_file = None
+        if is_pawn and abs(to_square.row - from_square.row) == 2 and self._pawn_beside(self.board, player, to_square.col):
+            self.en_passant_file = to_square.col
+            self.zobrist_key ^= EN_PASSANT_KEYS[to_square.col]
+
+        if captured_piece is not None or is_pawn:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if self.current_player == Player.BLACK:
+            self.fullmove_number += 1
+        self.current_player = self.current_player.opponent()
+        self.zobrist_key ^= BLACK_TO_MOVE_KEY
+
+    def unmake_move(self):
+        """
+        Takes back the most recent move made with make_move, restoring the board exactly.
+        """
+        (move, moving_piece, captured_piece, captured_square, moved, player, halfmove_clock, castling_rights,
+         en_passant_file, zobrist_key) = self._undo_stack.pop()
+        from_square, to_square = move.from_square, move.to_square
+
+        if type(moving_piece) is King and abs(to_square.col - from_square.col) == 2:
+            rook_from, rook_to = CASTLING_ROOK_MOVES[to_square]
+            self.set_piece(rook_from, self.get_piece(rook_to))
+            self.set_piece(rook_to, None)
+        self.set_piece(from_square, moving_piece)
+        self.set_piece(to_square, None)
+        if captured_piece is not None:
+            self.set_piece(captured_square, captured_piece)
+
+        moving_piece.moved = moved
+        self.current_player = player
+        self.halfmove_clock = halfmove_clock
+        if player == Player.BLACK:
+            self.fullmove_number -= 1
+        self.castling_rights = castling_rights
+        self.en_passant_file = en_passant_file
+        self.zobrist_key = zobrist_key
+
+    def pseudo_legal_moves(self):
+        """
+        All moves the pieces of the current player can make, ignoring whether they leave the king in check.
+        """
+        moves = []
+        for piece in self.pieces(self.current_player):
+            from_square = self._locations[piece]
+            for to_square in piece.get_available_moves(self):
+                self._add_moves(moves, piece, from_square, to_square)
+        return moves
+
+    @staticmethod
+    def _add_moves(moves, piece, from_square, to_square):
+        if type(piece) is Pawn and (to_square.row == 0 or to_square.row == BOARD_SIZE - 1):
+            moves.extend(Move(from_square, to_square, promotion) for promotion in PROMOTION_TYPES)
+        else:
+            moves.append(Move(from_square, to_square))
+
+    def legal_moves(self):
+        """
+        All moves the current player can make that do not leave their own king in check.
+
+        Only king moves, moves of pinned pieces, en passant captures and moves made while in check can
+        expose the king, so only those are tried on the board; every other pseudo-legal move is legal
+        as it stands.
+        """
+        player = self.current_player
+        kings = self._piece_lists[player][King]
+        if not kings:
+            return self.pseudo_legal_moves()
+        king = kings[0]
+        checked = self.in_check(player)
+        pinned = self.pinned_pieces(player)
+
+        grid = self.board
+        moves = []
+        for piece in self.pieces(player):
+            from_square = self._locations[piece]
+            needs_verifying = checked or piece is king or piece in pinned
+            is_pawn = type(piece) is Pawn
+            for to_square in piece.get_available_moves(self):
+                if needs_verifying or (is_pawn and to_square.col != from_square.col and
+                                       grid[to_square.row][to_square.col] is None):
+                    self.make_move(Move(from_square, to_square))
+                    leaves_check = self.in_check(player)
+                    self.unmake_move()
+                    if leaves_check:
+                        continue
+                self._add_moves(moves, piece, from_square, to_square)
+        return moves
+
+    def in_check(self, player=None):
+        """
+        Whether the king of the given player (by default the current player) is under attack. A player
+        with no king on the board is never in check.
+        """
+        player = player or self.current_player
+        kings = self._piece_lists[player][King]
+        if not kings:
+            return False
+        return self.is_attacked(self._locations[kings[0]], player.opponent())
+
+    def is_attacked(self, square, by_player):
+        """
+        Whether any piece of the given player attacks the given square. Rather than generating that
+        player's moves, this looks outwards from the square for a piece that could reach it.
+        """
+        grid = self.board
+        index = square.row * BOARD_SIZE + square.col
+
+        for attacker_square in KNIGHT_MOVES[index]:
+            piece = grid[attacker_square.row][attacker_square.col]
+            if piece is not None and piece.player == by_player and type(piece) is Knight:
+                return True
+        for attacker_square in KING_MOVES[index]:
+            piece = grid[attacker_square.row][attacker_square.col]
+            if piece is not None and piece.player == by_player and type(piece) is King:
+                return True
+        pawn_squares = BLACK_PAWN_CAPTURES if by_player == Player.WHITE else WHITE_PAWN_CAPTURES
+        for attacker_square in pawn_squares[index]:
+            piece = grid[attacker_square.row][attacker_square.col]
+            if piece is not None and piece.player == by_player and type(piece) is Pawn:
+                return True
+        return (self._slider_attacks(grid, ROOK_RAYS[index], by_player, Rook) or
+                self._slider_attacks(grid, BISHOP_RAYS[index], by_player, Bishop))
+
+    def pinned_pieces(self, player):
+        """
+        The set of the given player's pieces that are pinned to their king: moving one off the line
+        between the king and an enemy slider would expose the king.
+        """
+        kings = self._piece_lists[player][King]
+        if not kings:
+            return set()
+        king_square = self._locations[kings[0]]
+        index = king_square.row * BOARD_SIZE + king_square.col
+        grid = self.board
+        pinned = set()
+        for rays, slider_type in ((ROOK_RAYS[index], Rook), (BISHOP_RAYS[index], Bishop)):
+            for ray in rays:
+                blocker = None
+                for ray_square in ray:
+                    piece = grid[ray_square.row][ray_square.col]
+                    if piece is None:
+                        continue
+                    if blocker is None and piece.player == player:
+                        blocker = piece
+                        continue
+                    if (blocker is not None and piece.player != player and
+                            (type(piece) is slider_type or type(piece) is Queen)):
+                        pinned.add(blocker)
+                    break
+        return pinned
+
+    @staticmethod
+    def _slider_attacks(grid, rays, by_player, slider_type):
+        for ray in rays:
+            for ray_square in ray:
+                piece = grid[ray_square.row][ray_square.col]
+                if piece is not None:
+                    if piece.player == by_player and (type(piece) is slider_type or type(piece) is Queen):
+                        return True
+                    break
+        return False
 
     def squareBound(self, square):
         return 0 <= square.row < BOARD_SIZE and 0 <= square.col < BOARD_SIZE
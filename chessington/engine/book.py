@@ -0,0 +1,160 @@
+"""
+An opening book: the moves played from each position in a collection of games, stored on disk for
+fast lookup.
+
+The file starts with a 16-byte header (magic, format version, record size and record count) and is
+followed by fixed-size records of a position's Zobrist key, a move (16-bit encoded) and the number
+of times the move was played from that position. Records are sorted by key, then by descending
+weight, so the moves for a position are found by binary search over a memory map of the file
+without reading it into memory.
+"""
+
+import mmap
+import random
+import struct
+from collections import Counter, namedtuple
+
+from chessington.engine.board import Board
+from chessington.engine.encoding import encode_move, decode_move
+from chessington.engine.pgn import read_games
+
+MAGIC = b'CHBK'
+VERSION = 1
+
+_HEADER_FORMAT = struct.Struct('<4sHHQ')
+_RECORD_FORMAT = struct.Struct('<QHI')
+_KEY_FORMAT = struct.Struct('<Q')
+_MAX_WEIGHT = 0xFFFFFFFF
+
+HEADER_SIZE = _HEADER_FORMAT.size
+RECORD_SIZE = _RECORD_FORMAT.size
+
+BookEntry = namedtuple('BookEntry', 'move weight')
+
+
+class BookBuilder:
+    """
+    Collects the moves played in the first max_ply halfmoves of many games, to be written out as an
+    opening book.
+    """
+
+    def __init__(self, max_ply=20, board_class=Board):
+        self.max_ply = max_ply
+        self.board_class = board_class
+        self._counts = Counter()
+
+    def add_game(self, moves, board=None):
+        """
+        Adds the given moves of a game, played from the given board (by default the starting
+        position). The board is left as it was found.
+        """
+        board = board if board is not None else self.board_class.at_starting_position()
+        played = 0
+        try:
+            for move in moves:
+                if played >= self.max_ply:
+                    break
+                self._counts[board.zobrist_key, encode_move(move)] += 1
+                board.make_move(move)
+                played += 1
+        finally:
+            for _ in range(played):
+                board.unmake_move()
+
+    def add_pgn(self, source):
+        """
+        Adds every game in a PGN file, given as a path or an open text file. Only the moves within
+        max_ply are resolved, so the rest of each game costs nothing to add.
+        """
+        for game in read_games(source):
+            for ply, (board, move) in enumerate(game.replay(self.board_class)):
+                if ply >= self.max_ply:
+                    break
+                self._counts[board.zobrist_key, encode_move(move)] += 1
+
+    def write(self, path, min_weight=1):
+        """
+        Writes the book to the given path, leaving out moves played fewer than min_weight times.
+        """
+        records = sorted(((key, move_code, min(count, _MAX_WEIGHT))
+                          for (key, move_code), count in self._counts.items() if count >= min_weight),
+                         key=lambda record: (record[0], -record[2], record[1]))
+        with open(path, 'wb') as file:
+            file.write(_HEADER_FORMAT.pack(MAGIC, VERSION, RECORD_SIZE, len(records)))
+            file.write(b''.join(_RECORD_FORMAT.pack(*record) for record in records))
+
+
+class OpeningBook:
+    """
+    A read-only opening book file, probed by binary search over a memory map.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, self._count = _HEADER_FORMAT.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            self.close()
+            raise ValueError('{} is not an opening book'.format(self.path))
+
+    def __len__(self):
+        return self._count
+
+    def entries(self, board):
+        """
+        The book moves for the board's position, most played first. Moves that are not legal in the
+        position, which can only come from a Zobrist key collision, are left out.
+        """
+        key = board.zobrist_key
+        index = self._first_index(key)
+        entries = []
+        while index < self._count:
+            record_key, move_code, weight = _RECORD_FORMAT.unpack_from(self._map, HEADER_SIZE + index * RECORD_SIZE)
+            if record_key != key:
+                break
+            entries.append(BookEntry(decode_move(move_code), weight))
+            index += 1
+        if entries:
+            legal_moves = board.legal_moves()
+            entries = [entry for entry in entries if entry.move in legal_moves]
+        return entries
+
+    def best_move(self, board):
+        """
+        The most played book move in the board's position, or None if it is not in the book.
+        """
+        entries = self.entries(board)
+        return entries[0].move if entries else None
+
+    def choose_move(self, board, rng=random):
+        """
+        A book move in the board's position chosen at random in proportion to how often each was
+        played, or None if the position is not in the book.
+        """
+        entries = self.entries(board)
+        if not entries:
+            return None
+        return rng.choices([entry.move for entry in entries], [entry.weight for entry in entries])[0]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _first_index(self, key):
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if _KEY_FORMAT.unpack_from(self._map, HEADER_SIZE + middle * RECORD_SIZE)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
@@ -5,6 +5,14 @@ Data classes for easy representation of concepts such as a square on the board o
 from collections import namedtuple
 from enum import Enum, auto
 
+BOARD_SIZE = 8
+
+FILE_NAMES = 'abcdefgh'
+
+# Castling rights, combined as a bitfield.
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE = 1, 2, 4, 8
+ALL_CASTLING_RIGHTS = WHITE_KINGSIDE | WHITE_QUEENSIDE | BLACK_KINGSIDE | BLACK_QUEENSIDE
+
 class Player(Enum):
     """
     The two players in a game of chess.
@@ -19,12 +27,55 @@ class Player(Enum):
 
 class Square(namedtuple('Square', 'row col')):
     """
-    An immutable pair (row, col) representing the coordinates of a square.
+    An immutable pair (row, col) representing the coordinates of a square. The 64 squares on the
+    board are interned, so Square.at returns the same instance every time for a given square.
     """
 
+    __slots__ = ()
+
     @staticmethod
     def at(row, col):
         """
-        Creates a square at the given row and column.
+        Returns the square at the given row and column.
+        """
+        if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
+            return _SQUARES[row * BOARD_SIZE + col]
+        return Square(row=row, col=col)
+
+    @staticmethod
+    def from_index(index):
+        """
+        Returns the square with the given index, row * 8 + col.
+        """
+        return _SQUARES[index]
+
+    @staticmethod
+    def from_name(name):
+        """
+        Returns the square with the given algebraic name, such as 'e4'.
         """
-        return Square(row=row, col=col)
\ No newline at end of file
+        if len(name) != 2 or name[0] not in FILE_NAMES or name[1] not in '12345678':
+            raise ValueError('Invalid square name: {}'.format(name))
+        return Square.at(int(name[1]) - 1, FILE_NAMES.index(name[0]))
+
+    @property
+    def name(self):
+        """
+        The algebraic name of the square, such as 'e4'.
+        """
+        return FILE_NAMES[self.col] + str(self.row + 1)
+
+    def __reduce__(self):
+        return Square.at, tuple(self)
+
+
+_SQUARES = tuple(Square(row=row, col=col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE))
+
+
+class Move(namedtuple('Move', 'from_square to_square promotion', defaults=(None,))):
+    """
+    An immutable pair of squares describing a piece moving from one square to another, along with
+    the piece type a pawn is promoted to if the move promotes one (by default, a queen).
+    """
+
+    __slots__ = ()
@@ -0,0 +1,114 @@
+"""
+Compact integer and binary encodings of engine data, for storing in arrays and files.
+
+A move is encoded in 16 bits as ``from_index | to_index << 6 | promotion << 12``, where a square's
+index is ``row * 8 + col`` and promotion is 0 or the PROMOTION_CODES entry of the piece promoted
+to. A move never starts and ends on the same square, so 0 (NO_MOVE) means "no move".
+
+A position is packed into POSITION_SIZE bytes: 32 bytes holding one 4-bit piece code per square
+(the low nibble of byte i is square 2i, the high nibble square 2i + 1), then a flags byte (bit 0 set
+if black is to move, bits 1 to 4 the castling rights), the en passant file (0xFF for none), the
+halfmove clock (capped at 255) and the fullmove number as a little-endian 16-bit integer.
+"""
+
+import struct
+
+from chessington.engine.board import Board
+from chessington.engine.data import BOARD_SIZE, Player, Move, Square
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+NO_MOVE = 0
+
+PIECE_CODES = {Pawn: 1, Knight: 2, Bishop: 3, Rook: 4, Queen: 5, King: 6}
+PROMOTION_CODES = {Knight: 1, Bishop: 2, Rook: 3, Queen: 4}
+BLACK_PIECE_FLAG = 8
+
+_POSITION_FORMAT = struct.Struct('<32sBBBH')
+POSITION_SIZE = _POSITION_FORMAT.size
+
+_NO_EN_PASSANT = 0xFF
+_PIECE_TYPES = {code: piece_type for piece_type, code in PIECE_CODES.items()}
+_PROMOTION_TYPES = {code: piece_type for piece_type, code in PROMOTION_CODES.items()}
+
+
+def encode_move(move):
+    """
+    Encodes the given move (or None) as a 16-bit integer.
+    """
+    if move is None:
+        return NO_MOVE
+    from_square, to_square = move.from_square, move.to_square
+    code = (from_square.row * BOARD_SIZE + from_square.col) | (to_square.row * BOARD_SIZE + to_square.col) << 6
+    if move.promotion is not None:
+        code |= PROMOTION_CODES[move.promotion] << 12
+    return code
+
+
+def decode_move(code):
+    """
+    Decodes a move encoded with encode_move, returning None for NO_MOVE.
+    """
+    if code == NO_MOVE:
+        return None
+    return Move(Square.from_index(code & 0x3F), Square.from_index(code >> 6 & 0x3F), _PROMOTION_TYPES.get(code >> 12))
+
+
+def encode_position(board):
+    """
+    Packs the board's position into POSITION_SIZE bytes.
+    """
+    codes = []
+    for row in board.board:
+        for piece in row:
+            if piece is None:
+                codes.append(0)
+            elif piece.player == Player.WHITE:
+                codes.append(PIECE_CODES[type(piece)])
+            else:
+                codes.append(PIECE_CODES[type(piece)] | BLACK_PIECE_FLAG)
+    squares = bytes(codes[i] | codes[i + 1] << 4 for i in range(0, BOARD_SIZE * BOARD_SIZE, 2))
+    flags = (1 if board.current_player == Player.BLACK else 0) | board.castling_rights << 1
+    en_passant = _NO_EN_PASSANT if board.en_passant_file is None else board.en_passant_file
+    return _POSITION_FORMAT.pack(squares, flags, en_passant, min(board.halfmove_clock, 0xFF),
+                                 board.fullmove_number)
+
+
+def decode_position(data, board_class=Board):
+    """
+    Unpacks a position packed with encode_position into a new board of the given class.
+    """
+    squares, flags, en_passant, halfmove_clock, fullmove_number = _POSITION_FORMAT.unpack(data)
+    board_state = []
+    for row in range(BOARD_SIZE):
+        pieces = []
+        for byte in squares[row * 4:row * 4 + 4]:
+            for code in (byte & 0xF, byte >> 4):
+                if not code:
+                    pieces.append(None)
+                    continue
+                player = Player.BLACK if code & BLACK_PIECE_FLAG else Player.WHITE
+                pieces.append(_PIECE_TYPES[code & 0x7](player))
+        board_state.append(pieces)
+    board = board_class(Player.BLACK if flags & 1 else Player.WHITE, board_state, flags >> 1 & 0xF,
+                        None if en_passant == _NO_EN_PASSANT else en_passant)
+    board.halfmove_clock = halfmove_clock
+    board.fullmove_number = fullmove_number
+    return board
+
+
+def encode_positions(boards):
+    """
+    Packs a sequence of boards into one contiguous block of bytes.
+    """
+    return b''.join(encode_position(board) for board in boards)
+
+
+def decode_positions(data, board_class=Board):
+    """
+    Lazily unpacks each position from a block of bytes produced by encode_positions.
+    """
+    view = memoryview(data)
+    if len(view) % POSITION_SIZE:
+        raise ValueError('Data is not a whole number of packed positions')
+    for offset in range(0, len(view), POSITION_SIZE):
+        yield decode_position(view[offset:offset + POSITION_SIZE], board_class)
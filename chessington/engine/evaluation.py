@@ -0,0 +1,127 @@
+"""
+Static evaluation of chess positions by material and piece-square tables.
+
+Every (player, piece type, square) combination has a fixed score, from white's point of view, made up
+of the piece's material value plus a positional bonus. Board keeps the sum of these scores up to
+date as board.evaluation_score whenever a piece is placed or removed, so evaluating a position is a
+single lookup rather than a scan of the board.
+"""
+
+from chessington.engine.data import BOARD_SIZE, Player
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+PIECE_VALUES = {Pawn: 100, Knight: 320, Bishop: 330, Rook: 500, Queen: 900, King: 0}
+
+# Positional bonuses for white pieces, laid out as seen from white's side of the board: the first
+# row of each table is the eighth rank, the last row the first rank.
+PIECE_SQUARE_TABLES = {
+    Pawn: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ),
+    Knight: (
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ),
+    Bishop: (
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ),
+    Rook: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0,
+    ),
+    Queen: (
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20,
+    ),
+    King: (
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20,
+    ),
+}
+
+
+def _square_scores(piece_type, player):
+    table = PIECE_SQUARE_TABLES[piece_type]
+    value = PIECE_VALUES[piece_type]
+    scores = []
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE):
+            if player == Player.WHITE:
+                scores.append(value + table[(BOARD_SIZE - 1 - row) * BOARD_SIZE + col])
+            else:
+                scores.append(-value - table[row * BOARD_SIZE + col])
+    return tuple(scores)
+
+
+# The score, from white's point of view, contributed by each piece on each square index.
+SQUARE_SCORES = {
+    player: {piece_type: _square_scores(piece_type, player) for piece_type in PIECE_SQUARE_TABLES}
+    for player in Player
+}
+
+
+def square_score(piece, square):
+    """
+    The score, from white's point of view, contributed by the given piece standing on the given square.
+    """
+    return SQUARE_SCORES[piece.player][type(piece)][square.row * BOARD_SIZE + square.col]
+
+
+def compute_score(board):
+    """
+    Computes the score of the board's position from white's point of view from scratch. Board
+    maintains the same value incrementally as board.evaluation_score.
+    """
+    score = 0
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE):
+            piece = board.board[row][col]
+            if piece is not None:
+                score += SQUARE_SCORES[piece.player][type(piece)][row * BOARD_SIZE + col]
+    return score
+
+
+def evaluate(board):
+    """
+    The evaluation of the board's position from the point of view of the player to move.
+    """
+    score = board.evaluation_score
+    return score if board.current_player == Player.WHITE else -score
@@ -0,0 +1,149 @@
+"""
+A record of a game of chess: the board, the moves played and the positions reached, with the draw
+rules that depend on the game's history and export to Portable Game Notation (PGN).
+
+Every position reached is counted in a multiset keyed by Zobrist key, so checking for threefold
+repetition is a single lookup rather than a scan back through the game. The fifty-move rule is read
+straight from the board's halfmove clock.
+"""
+
+from collections import Counter
+
+from chessington.engine.board import Board, STARTING_FEN
+from chessington.engine.data import Player
+from chessington.engine.notation import move_to_san
+
+WHITE_WINS = '1-0'
+BLACK_WINS = '0-1'
+DRAW = '1/2-1/2'
+IN_PROGRESS = '*'
+
+# The number of halfmoves without a capture or pawn move after which a game is drawn.
+FIFTY_MOVE_HALFMOVES = 100
+
+_PGN_LINE_LENGTH = 80
+
+_SEVEN_TAG_ROSTER = ('Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result')
+
+
+class Game:
+    """
+    A game of chess played from a starting position, by default the standard one.
+    """
+
+    def __init__(self, board=None):
+        self.board = board if board is not None else Board.at_starting_position()
+        self.initial_fen = self.board.to_fen()
+        self.moves = []
+        self._position_counts = Counter((self.board.zobrist_key,))
+
+    def play(self, move):
+        """
+        Plays the given move, which must be legal in the current position.
+        """
+        self.board.make_move(move)
+        self.moves.append(move)
+        self._position_counts[self.board.zobrist_key] += 1
+
+    def undo(self):
+        """
+        Takes back the most recent move, returning it.
+        """
+        key = self.board.zobrist_key
+        self._position_counts[key] -= 1
+        if not self._position_counts[key]:
+            del self._position_counts[key]
+        self.board.unmake_move()
+        return self.moves.pop()
+
+    def repetition_count(self):
+        """
+        The number of times the current position has occurred in the game, including now.
+        """
+        return self._position_counts[self.board.zobrist_key]
+
+    def is_threefold_repetition(self):
+        return self.repetition_count() >= 3
+
+    def is_fifty_move_rule(self):
+        return self.board.halfmove_clock >= FIFTY_MOVE_HALFMOVES
+
+    def is_draw_by_rule(self):
+        """
+        Whether the game is drawn by threefold repetition or the fifty-move rule. Unlike result, this
+        needs no move generation, so it is cheap enough to check after every move.
+        """
+        return self.is_threefold_repetition() or self.is_fifty_move_rule()
+
+    def result(self):
+        """
+        The result of the game as written in PGN: '1-0', '0-1', '1/2-1/2' for checkmate, stalemate or
+        a draw by rule, or '*' if the game is still in progress.
+        """
+        if not self.board.legal_moves():
+            if not self.board.in_check():
+                return DRAW
+            return BLACK_WINS if self.board.current_player == Player.WHITE else WHITE_WINS
+        if self.is_draw_by_rule():
+            return DRAW
+        return IN_PROGRESS
+
+    def is_over(self):
+        return self.result() != IN_PROGRESS
+
+    def san_moves(self):
+        """
+        The moves of the game in Standard Algebraic Notation.
+        """
+        board = Board.from_fen(self.initial_fen)
+        sans = []
+        for move in self.moves:
+            sans.append(move_to_san(board, move))
+            board.make_move(move)
+        return sans
+
+    def to_pgn(self, tags=None):
+        """
+        Exports the game in Portable Game Notation. The given tags are added to the seven required
+        tags, which default to '?' and the game's current result.
+        """
+        tags = dict(tags or {})
+        result = tags.setdefault('Result', self.result())
+        if self.initial_fen != STARTING_FEN:
+            tags.setdefault('SetUp', '1')
+            tags.setdefault('FEN', self.initial_fen)
+        names = list(_SEVEN_TAG_ROSTER) + sorted(name for name in tags if name not in _SEVEN_TAG_ROSTER)
+        lines = ['[{} "{}"]'.format(name, str(tags.get(name, '?')).replace('\\', '\\\\').replace('"', '\\"'))
+                 for name in names]
+        lines.append('')
+        lines.extend(_wrap(self._movetext_tokens(result)))
+        return '\n'.join(lines) + '\n'
+
+    def _movetext_tokens(self, result):
+        fields = self.initial_fen.split()
+        white_to_move = fields[1] == 'w'
+        move_number = int(fields[5])
+        tokens = []
+        for ply, san in enumerate(self.san_moves()):
+            if white_to_move:
+                tokens.append('{}.'.format(move_number))
+            elif ply == 0:
+                tokens.append('{}...'.format(move_number))
+            tokens.append(san)
+            if not white_to_move:
+                move_number += 1
+            white_to_move = not white_to_move
+        tokens.append(result)
+        return tokens
+
+
+def _wrap(tokens):
+    lines, line = [], ''
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > _PGN_LINE_LENGTH:
+            lines.append(line)
+            line = token
+        else:
+            line = line + ' ' + token if line else token
+    lines.append(line)
+    return lines
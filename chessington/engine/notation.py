@@ -0,0 +1,107 @@
+"""
+Standard Algebraic Notation (SAN), the move notation used in PGN files, such as 'Nf3', 'exd5',
+'O-O' or 'e8=Q+'.
+"""
+
+import re
+
+from chessington.engine.data import BOARD_SIZE, Player, Square, Move, FILE_NAMES
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+SAN_LETTERS = {Knight: 'N', Bishop: 'B', Rook: 'R', Queen: 'Q', King: 'K'}
+_SAN_PIECE_TYPES = {letter: piece_type for piece_type, letter in SAN_LETTERS.items()}
+
+_SAN_PATTERN = re.compile(r'([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?')
+
+
+def move_to_san(board, move, legal_moves=None):
+    """
+    Describes the given legal move in the board's current position in Standard Algebraic Notation.
+    The position's legal moves can be passed in if already known, to save generating them again.
+    """
+    from_square, to_square = move.from_square, move.to_square
+    piece = board.get_piece(from_square)
+    piece_type = type(piece)
+
+    if piece_type is King and abs(to_square.col - from_square.col) == 2:
+        san = 'O-O' if to_square.col > from_square.col else 'O-O-O'
+    elif piece_type is Pawn:
+        is_capture = from_square.col != to_square.col
+        san = (from_square.name[0] + 'x' if is_capture else '') + to_square.name
+        if to_square.row == 0 or to_square.row == BOARD_SIZE - 1:
+            san += '=' + SAN_LETTERS[move.promotion or Queen]
+    else:
+        if legal_moves is None:
+            legal_moves = board.legal_moves()
+        san = SAN_LETTERS[piece_type] + _disambiguation(board, move, piece_type, legal_moves)
+        if board.get_piece(to_square) is not None:
+            san += 'x'
+        san += to_square.name
+
+    board.make_move(move)
+    try:
+        if board.in_check():
+            san += '#' if not board.legal_moves() else '+'
+    finally:
+        board.unmake_move()
+    return san
+
+
+def _disambiguation(board, move, piece_type, legal_moves):
+    from_square, to_square = move.from_square, move.to_square
+    rivals = [other.from_square for other in legal_moves
+              if other.to_square == to_square and other.from_square != from_square and
+              type(board.get_piece(other.from_square)) is piece_type]
+    if not rivals:
+        return ''
+    if all(square.col != from_square.col for square in rivals):
+        return from_square.name[0]
+    if all(square.row != from_square.row for square in rivals):
+        return from_square.name[1]
+    return from_square.name
+
+
+def san_to_move(board, san):
+    """
+    Finds the legal move in the board's current position described by the given Standard Algebraic
+    Notation. Only the pieces that could make the move are considered, rather than every legal move
+    in the position. Raises ValueError if no legal move, or more than one, matches.
+    """
+    text = san.rstrip('+#!?')
+    player = board.current_player
+    if text in ('O-O', '0-0', 'O-O-O', '0-0-0'):
+        row = 0 if player == Player.WHITE else BOARD_SIZE - 1
+        piece_type, from_file, from_rank = King, 4, row
+        to_square = Square.at(row, 6 if len(text) == 3 else 2)
+        promotion = None
+    else:
+        match = _SAN_PATTERN.fullmatch(text)
+        if match is None:
+            raise ValueError('Invalid SAN move: {}'.format(san))
+        letter, file_name, rank_name, to_name, promotion_letter = match.groups()
+        piece_type = _SAN_PIECE_TYPES[letter] if letter else Pawn
+        from_file = FILE_NAMES.index(file_name) if file_name else None
+        from_rank = int(rank_name) - 1 if rank_name else None
+        to_square = Square.from_name(to_name)
+        promotion = _SAN_PIECE_TYPES[promotion_letter] if promotion_letter else None
+
+    candidates = []
+    for piece in board.pieces(player, piece_type):
+        from_square = board.find_piece(piece)
+        if (from_file is not None and from_square.col != from_file or
+                from_rank is not None and from_square.row != from_rank or
+                to_square not in piece.get_available_moves(board)):
+            continue
+        if piece_type is Pawn and (to_square.row == 0 or to_square.row == BOARD_SIZE - 1):
+            move = Move(from_square, to_square, promotion or Queen)
+        else:
+            move = Move(from_square, to_square)
+        board.make_move(move)
+        leaves_check = board.in_check(player)
+        board.unmake_move()
+        if not leaves_check:
+            candidates.append(move)
+
+    if len(candidates) != 1:
+        raise ValueError('{} SAN move in this position: {}'.format('Ambiguous' if candidates else 'Illegal', san))
+    return candidates[0]
@@ -0,0 +1,98 @@
+"""
+Perft ("performance test") node counting for validating and benchmarking the move generator. The
+number of leaf nodes of the legal move tree to a fixed depth is compared against published
+reference values, and the rate at which they are generated is reported.
+"""
+
+import argparse
+import sys
+import time
+from collections import namedtuple
+
+from chessington.engine.bitboard import BitBoard
+from chessington.engine.board import Board, STARTING_FEN
+
+PerftPosition = namedtuple('PerftPosition', 'name fen expected')
+PerftResult = namedtuple('PerftResult', 'name depth nodes expected seconds')
+
+# Reference positions and node counts from the Chess Programming Wiki's perft results.
+PERFT_POSITIONS = [
+    PerftPosition('start', STARTING_FEN, {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609}),
+    PerftPosition('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                  {1: 48, 2: 2039, 3: 97862, 4: 4085603}),
+    PerftPosition('position3', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+                  {1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624}),
+    PerftPosition('position4', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+                  {1: 6, 2: 264, 3: 9467, 4: 422333}),
+    PerftPosition('position5', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+                  {1: 44, 2: 1486, 3: 62379, 4: 2103487}),
+    PerftPosition('position6', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+                  {1: 46, 2: 2079, 3: 89890, 4: 3894594}),
+]
+
+
+def perft(board, depth):
+    """
+    Counts the leaf nodes of the legal move tree of the given depth from the board's position.
+    """
+    if depth == 0:
+        return 1
+    moves = board.legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def divide(board, depth):
+    """
+    Splits the perft count of the given depth by root move, which helps to track down move
+    generation bugs by comparison with another engine.
+    """
+    counts = {}
+    for move in board.legal_moves():
+        board.make_move(move)
+        counts[move] = perft(board, depth - 1)
+        board.unmake_move()
+    return counts
+
+
+def run_benchmark(max_depth=3, positions=PERFT_POSITIONS, board_class=Board, report=print):
+    """
+    Runs perft on each reference position up to the given depth, reporting node counts and nodes per
+    second. Returns the list of results; any whose node count differs from the expected one is a
+    failure.
+    """
+    results = []
+    for position in positions:
+        for depth in sorted(d for d in position.expected if d <= max_depth):
+            board = board_class.from_fen(position.fen)
+            start = time.perf_counter()
+            nodes = perft(board, depth)
+            seconds = time.perf_counter() - start
+            result = PerftResult(position.name, depth, nodes, position.expected[depth], seconds)
+            results.append(result)
+            report('{:<12} depth {}  nodes {:>10}  {:>10.0f} nps  {}'.format(
+                result.name, depth, nodes, nodes / seconds if seconds else 0,
+                'ok' if nodes == result.expected else 'FAIL (expected {})'.format(result.expected)))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run perft on the reference positions.')
+    parser.add_argument('--depth', type=int, default=3, help='maximum depth to search (default 3)')
+    parser.add_argument('--bitboard', action='store_true', help='use the bitboard representation')
+    args = parser.parse_args(argv)
+
+    board_class = BitBoard if args.bitboard else Board
+    results = run_benchmark(args.depth, board_class=board_class)
+    failures = [result for result in results if result.nodes != result.expected]
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
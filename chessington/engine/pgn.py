@@ -0,0 +1,194 @@
+"""
+A streaming reader for Portable Game Notation (PGN) files.
+
+Files are read a line at a time and games are yielded as soon as each one ends, so an archive of any
+size is read in constant memory. Each game's moves are kept as SAN text until replayed, when they are
+resolved against the board's move generation one at a time.
+
+Large files can be split at game boundaries and read by a pool of worker processes, each parsing its
+own byte range of the file.
+"""
+
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from chessington.engine.board import Board
+from chessington.engine.notation import san_to_move
+from chessington.engine.pool import map_bounded
+
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+_TAG_PATTERN = re.compile(r'\[\s*(\w+)\s*"((?:[^"\\]|\\.)*)"\s*\]')
+_TOKEN_PATTERN = re.compile(r'[{}();]|\$\d+|1-0|0-1|1/2-1/2|\*|\d+\.+|[^\s{}();$]+')
+
+
+class PgnGame(namedtuple('PgnGame', 'tags moves result')):
+    """
+    A game read from a PGN file: its tags as a dict, its main line as a list of SAN moves, and its
+    result ('1-0', '0-1', '1/2-1/2' or '*').
+    """
+
+    __slots__ = ()
+
+    def initial_board(self, board_class=Board):
+        """
+        Creates a board at the game's starting position, given by its FEN tag if it has one.
+        """
+        fen = self.tags.get('FEN')
+        return board_class.from_fen(fen) if fen else board_class.at_starting_position()
+
+    def replay(self, board_class=Board):
+        """
+        Replays the game, yielding a (board, move) pair for each move with the board in the position
+        before the move. The same board is advanced after each pair is yielded, so callers that keep
+        positions should copy what they need. Raises ValueError on an illegal or ambiguous move.
+        """
+        board = self.initial_board(board_class)
+        for san in self.moves:
+            move = san_to_move(board, san)
+            yield board, move
+            board.make_move(move)
+
+
+def read_games(source):
+    """
+    Yields each game in a PGN file, given as a path or an open text file, as a PgnGame.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8', errors='replace') as file:
+            yield from _parse_games(file)
+    else:
+        yield from _parse_games(source)
+
+
+def read_positions(source, board_class=Board):
+    """
+    Yields a (game, board, move) triple for every move of every game in a PGN file; see
+    PgnGame.replay.
+    """
+    for game in read_games(source):
+        for board, move in game.replay(board_class):
+            yield game, board, move
+
+
+def map_games(path, function, processes=None, chunk_bytes=1 << 22, ordered=True):
+    """
+    Applies the function to every game in the PGN file at the given path, across the given number of
+    worker processes (by default one per CPU), and yields the results. The file is split into chunks
+    of about chunk_bytes bytes at game boundaries, and each worker reads its chunks straight from the
+    file. Results are yielded in file order if ordered is true, or else as each chunk completes. The
+    function must be picklable, such as a function defined at module level.
+    """
+    processes = processes or os.cpu_count() or 1
+    ranges = _chunk_ranges(path, chunk_bytes)
+
+    with ProcessPoolExecutor(processes) as executor:
+        arguments = ((path, start, end, function) for start, end in ranges)
+        for results in map_bounded(executor, _map_range, arguments, processes, ordered):
+            yield from results
+
+
+def split_games(path, parts):
+    """
+    Splits the PGN file at the given path into at most the given number of byte ranges of roughly
+    equal size, each starting at the beginning of a game. Returns a list of (start, end) offsets.
+    """
+    size = os.path.getsize(path)
+    return list(_chunk_ranges(path, max(1, -(-size // max(1, parts)))))
+
+
+def _chunk_ranges(path, chunk_bytes):
+    size = os.path.getsize(path)
+    with open(path, 'rb') as file:
+        start = 0
+        while start < size:
+            end = _next_game_start(file, start + chunk_bytes, size)
+            yield start, end
+            start = end
+
+
+def _next_game_start(file, offset, size):
+    """
+    The offset of the first tag line at or after the given offset that follows a line that is not a
+    tag line, which is where a game starts, or the file size if there is none.
+    """
+    if offset >= size:
+        return size
+    file.seek(offset - 1)
+    if file.read(1) != b'\n':
+        file.readline()
+    previous_is_tag = True
+    while True:
+        line_start = file.tell()
+        line = file.readline()
+        if not line:
+            return size
+        is_tag = line.lstrip().startswith(b'[')
+        if is_tag and not previous_is_tag:
+            return line_start
+        previous_is_tag = is_tag
+
+
+def _map_range(path, start, end, function):
+    return [function(game) for game in _parse_games(_read_lines(path, start, end))]
+
+
+def _read_lines(path, start, end):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while file.tell() < end:
+            line = file.readline()
+            if not line:
+                return
+            yield line.decode('utf-8', errors='replace')
+
+
+def _parse_games(lines):
+    tags, moves = {}, []
+    in_comment = False
+    variation_depth = 0
+    for line in lines:
+        if not in_comment:
+            stripped = line.strip()
+            if stripped.startswith('%'):
+                continue
+            if stripped.startswith('[') and not variation_depth:
+                if moves:
+                    yield PgnGame(tags, moves, '*')
+                    tags, moves = {}, []
+                for name, value in _TAG_PATTERN.findall(stripped):
+                    tags[name] = value.replace('\\"', '"').replace('\\\\', '\\')
+                continue
+
+        position = 0
+        while True:
+            if in_comment:
+                end = line.find('}', position)
+                if end < 0:
+                    break
+                in_comment, position = False, end + 1
+                continue
+            match = _TOKEN_PATTERN.search(line, position)
+            if match is None:
+                break
+            token, position = match.group(), match.end()
+            if token == '{':
+                in_comment = True
+            elif token == ';':
+                break
+            elif token == '(':
+                variation_depth += 1
+            elif token == ')':
+                variation_depth = max(0, variation_depth - 1)
+            elif variation_depth or token == '}' or token[0] == '$' or token[-1] == '.':
+                continue
+            elif token in RESULTS:
+                yield PgnGame(tags, moves, token)
+                tags, moves = {}, []
+            else:
+                moves.append(token)
+
+    if tags or moves:
+        yield PgnGame(tags, moves, '*')
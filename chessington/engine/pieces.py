@@ -4,13 +4,16 @@ Definitions of each of the different chess pieces.
 
 from abc import ABC, abstractmethod
 
-from chessington.engine.data import Player, Square
+from chessington.engine.data import Player, Square, WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE
+from chessington.engine.tables import KNIGHT_MOVES, KING_MOVES, ROOK_RAYS, BISHOP_RAYS, QUEEN_RAYS, square_index
 
 class Piece(ABC):
     """
     An abstract base class from which all pieces inherit.
     """
 
+    __slots__ = ('player', 'moved')
+
     def __init__(self, player):
         self.player = player
         self.moved = False
@@ -42,12 +45,42 @@ class Piece(ABC):
     def capture_piece(self, piece):
         return piece.player != self.player
 
+    def _unblocked(self, board, squares):
+        """
+        Filters squares already known to be on the board down to those that are empty or hold an
+        enemy piece.
+        """
+        moves = []
+        for square in squares:
+            piece = board.get_piece(square)
+            if piece is None or piece.player != self.player:
+                moves.append(square)
+        return moves
+
+    def _slide(self, board, rays):
+        """
+        Walks each ray outwards, stopping at the first piece and including it if it can be captured.
+        """
+        moves = []
+        for ray in rays:
+            for square in ray:
+                piece = board.get_piece(square)
+                if piece is None:
+                    moves.append(square)
+                else:
+                    if piece.player != self.player:
+                        moves.append(square)
+                    break
+        return moves
+
 
 class Pawn(Piece):
     """
     A class representing a chess pawn.
     """
 
+    __slots__ = ()
+
     def get_available_moves(self, board):
 
         location = board.find_piece(self)  # Finds current position of piece
@@ -67,6 +100,12 @@ class Pawn(Piece):
         board_capture = [Square.at(location.row + piece, location.col + 1), Square.at(location.row + piece, location.col - 1)]
         board_capture = list(filter(lambda square: self.can_capture(board, square), board_capture))
 
+        # En passant: capture a pawn that has just moved two squares past this one
+        en_passant_file = board.en_passant_file
+        en_passant_row = 4 if self.player == Player.WHITE else 3
+        if en_passant_file is not None and location.row == en_passant_row and abs(location.col - en_passant_file) == 1:
+            board_capture.append(Square.at(location.row + piece, en_passant_file))
+
         return board_moves + board_capture
 
 
@@ -75,15 +114,11 @@ class Knight(Piece):
     A class representing a chess knight.
     """
 
+    __slots__ = ()
+
     def get_available_moves(self, board):
         location = board.find_piece(self)
-        knight_moves = [
-            Square.at(location.row + 2, location.col + 1), Square.at(location.row + 2, location.col - 1),
-            Square.at(location.row + 1, location.col + 2), Square.at(location.row + 1, location.col - 2),
-            Square.at(location.row - 2, location.col + 1), Square.at(location.row - 2, location.col - 1),
-            Square.at(location.row - 1, location.col + 2), Square.at(location.row - 1, location.col - 2),
-        ]
-        return list(filter(lambda square: self.is_free(board, square), knight_moves))
+        return self._unblocked(board, KNIGHT_MOVES[square_index(location)])
 
 
 class Bishop(Piece):
@@ -91,8 +126,11 @@ class Bishop(Piece):
     A class representing a chess bishop.
     """
 
+    __slots__ = ()
+
     def get_available_moves(self, board):
-        return []
+        location = board.find_piece(self)
+        return self._slide(board, BISHOP_RAYS[square_index(location)])
 
 
 class Rook(Piece):
@@ -100,8 +138,11 @@ class Rook(Piece):
     A class representing a chess rook.
     """
 
+    __slots__ = ()
+
     def get_available_moves(self, board):
-        return []
+        location = board.find_piece(self)
+        return self._slide(board, ROOK_RAYS[square_index(location)])
 
 
 class Queen(Piece):
@@ -109,8 +150,11 @@ class Queen(Piece):
     A class representing a chess queen.
     """
 
+    __slots__ = ()
+
     def get_available_moves(self, board):
-        return []
+        location = board.find_piece(self)
+        return self._slide(board, QUEEN_RAYS[square_index(location)])
 
 
 class King(Piece):
@@ -118,13 +162,35 @@ class King(Piece):
     A class representing a chess king.
     """
 
+    __slots__ = ()
+
     def get_available_moves(self, board):
         location = board.find_piece(self)
+        return self._unblocked(board, KING_MOVES[square_index(location)]) + self.castling_moves(board, location)
 
-        king_moves = [
-            Square.at(location.row + 1, location.col + 1), Square.at(location.row + 1, location.col), Square.at(location.row + 1, location.col - 1),
-            Square.at(location.row, location.col + 1), Square.at(location.row, location.col - 1),
-            Square.at(location.row - 1, location.col + 1), Square.at(location.row - 1, location.col), Square.at(location.row - 1, location.col - 1)
-        ]
-
-        return list(filter(lambda square: self.is_free(board, square), king_moves))
\ No newline at end of file
+    def castling_moves(self, board, location):
+        """
+        The squares the king, standing on the given square, can castle to.
+        """
+        moves = []
+        if self.player == Player.WHITE:
+            home_row, kingside, queenside = 0, WHITE_KINGSIDE, WHITE_QUEENSIDE
+        else:
+            home_row, kingside, queenside = 7, BLACK_KINGSIDE, BLACK_QUEENSIDE
+        rights = board.castling_rights & (kingside | queenside)
+        if rights and location == Square.at(home_row, 4) and not board.is_attacked(location, self.player.opponent()):
+            if rights & kingside and self._can_castle(board, home_row, 7, (5, 6), 5):
+                moves.append(Square.at(home_row, 6))
+            if rights & queenside and self._can_castle(board, home_row, 0, (1, 2, 3), 3):
+                moves.append(Square.at(home_row, 2))
+        return moves
+
+    def _can_castle(self, board, row, rook_col, between_cols, passing_col):
+        """
+        Whether the rook is in place, the squares between it and the king are empty, and the square
+        the king passes over is not attacked. The king's destination is checked like any other move.
+        """
+        rook = board.get_piece(Square.at(row, rook_col))
+        return (isinstance(rook, Rook) and rook.player == self.player and
+                all(board.get_piece(Square.at(row, col)) is None for col in between_cols) and
+                not board.is_attacked(Square.at(row, passing_col), self.player.opponent()))
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Streaming work through a pool of worker processes with a bounded number of tasks in flight, so that
+arbitrarily long inputs are processed in constant memory.
+"""
+
+from collections import deque
+from concurrent.futures import wait, FIRST_COMPLETED
+from itertools import islice
+
+# The number of tasks kept queued for each worker process, so that none waits for its next task.
+TASKS_IN_FLIGHT_PER_PROCESS = 2
+
+
+def map_bounded(executor, function, argument_tuples, processes, ordered=True):
+    """
+    Calls the function with each tuple of arguments on the executor, which has the given number of
+    worker processes, and yields the results. Tasks are submitted only as earlier ones finish, so at
+    most TASKS_IN_FLIGHT_PER_PROCESS per process are outstanding at once. Results are yielded in the
+    order of the arguments if ordered is true, or else as each task completes.
+    """
+    argument_tuples = iter(argument_tuples)
+
+    def submit(arguments):
+        return executor.submit(function, *arguments)
+
+    in_flight = deque(submit(arguments) for arguments in islice(argument_tuples, processes * TASKS_IN_FLIGHT_PER_PROCESS))
+    while in_flight:
+        if ordered:
+            finished = [in_flight.popleft()]
+        else:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            finished = [future for future in in_flight if future in done]
+            for future in finished:
+                in_flight.remove(future)
+        for future in finished:
+            for arguments in islice(argument_tuples, 1):
+                in_flight.append(submit(arguments))
+            yield future.result()
@@ -0,0 +1,177 @@
+"""
+A file of packed positions, read through a memory map, for analysing large position sets with
+constant memory.
+
+The file starts with a 16-byte header (magic, format version, record size and record count) and is
+followed by fixed-size records. Each record is a position packed with encoding.encode_position,
+followed by space for an analysis result: the best move (16-bit encoded), the score, the search depth
+and a flags byte marking whether a result has been stored.
+"""
+
+import mmap
+import os
+import struct
+from collections import namedtuple
+from collections.abc import Sequence
+from itertools import islice
+
+from chessington.engine.board import Board
+from chessington.engine.encoding import (encode_position, decode_position, encode_move, decode_move,
+                                         POSITION_SIZE)
+
+MAGIC = b'CHPD'
+VERSION = 1
+
+_HEADER_FORMAT = struct.Struct('<4sHHQ')
+_RESULT_FORMAT = struct.Struct('<HiBB')
+_EMPTY_RESULT = _RESULT_FORMAT.pack(0, 0, 0, 0)
+_HAS_RESULT = 1
+
+HEADER_SIZE = _HEADER_FORMAT.size
+RECORD_SIZE = POSITION_SIZE + _RESULT_FORMAT.size
+
+# The number of records encoded and written at a time by extend.
+_EXTEND_BATCH_SIZE = 4096
+
+AnalysisRecord = namedtuple('AnalysisRecord', 'move score depth')
+
+
+class PositionDatabase(Sequence):
+    """
+    A sequence of the positions stored in a position database file. Indexing decodes a single
+    position into a new board on demand, so the positions are never all held in memory at once.
+    """
+
+    def __init__(self, path, writable=False, board_class=Board):
+        self.path = path
+        self.writable = writable
+        self.board_class = board_class
+        self._file = open(path, 'r+b' if writable else 'rb')
+        self._map = None
+        self._count = 0
+        self._remap()
+
+    @classmethod
+    def create(cls, path, boards=(), board_class=Board):
+        """
+        Creates a new database file at the given path holding the given positions, and opens it for
+        writing.
+        """
+        with open(path, 'wb') as file:
+            file.write(_HEADER_FORMAT.pack(MAGIC, VERSION, RECORD_SIZE, 0))
+        database = cls(path, writable=True, board_class=board_class)
+        database.extend(boards)
+        return database
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        return decode_position(self.position_bytes(index), self.board_class)
+
+    def position_bytes(self, index):
+        """
+        A zero-copy view of the packed position at the given index. The view stays valid after the
+        database is extended or closed, and keeps the memory it was taken from mapped until it is
+        released.
+        """
+        offset = self._offset(index)
+        return memoryview(self._map)[offset:offset + POSITION_SIZE]
+
+    def extend(self, boards):
+        """
+        Appends the given positions to the end of the file, with no results. The positions are
+        written in batches, so any number can be added from an iterator in bounded memory, and the
+        record count in the header is updated once at the end.
+        """
+        self._require_writable()
+        boards = iter(boards)
+        batch = list(islice(boards, _EXTEND_BATCH_SIZE))
+        if not batch:
+            return
+        count = self._count
+        try:
+            self._file.seek(HEADER_SIZE + count * RECORD_SIZE)
+            while batch:
+                self._file.write(b''.join(encode_position(board) + _EMPTY_RESULT for board in batch))
+                count += len(batch)
+                batch = list(islice(boards, _EXTEND_BATCH_SIZE))
+        finally:
+            self._file.truncate(HEADER_SIZE + count * RECORD_SIZE)
+            self._file.seek(0)
+            self._file.write(_HEADER_FORMAT.pack(MAGIC, VERSION, RECORD_SIZE, count))
+            self._file.flush()
+            self._release_map()
+            self._remap()
+
+    def append(self, board):
+        self.extend([board])
+
+    def set_result(self, index, move, score, depth):
+        """
+        Stores the analysis result for the position at the given index in place.
+        """
+        self._require_writable()
+        offset = self._offset(index) + POSITION_SIZE
+        self._map[offset:offset + _RESULT_FORMAT.size] = _RESULT_FORMAT.pack(
+            encode_move(move), score, depth, _HAS_RESULT)
+
+    def get_result(self, index):
+        """
+        Returns the AnalysisRecord stored for the position at the given index, or None.
+        """
+        offset = self._offset(index) + POSITION_SIZE
+        move_code, score, depth, flags = _RESULT_FORMAT.unpack_from(self._map, offset)
+        if not flags & _HAS_RESULT:
+            return None
+        return AnalysisRecord(decode_move(move_code), score, depth)
+
+    def flush(self):
+        if self.writable:
+            self._map.flush()
+
+    def close(self):
+        if self._map is not None:
+            self.flush()
+            self._release_map()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _remap(self):
+        access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+        self._map = mmap.mmap(self._file.fileno(), 0, access=access)
+        magic, version, record_size, count = _HEADER_FORMAT.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            self._map.close()
+            self._file.close()
+            raise ValueError('{} is not a position database'.format(self.path))
+        self._count = count
+
+    def _release_map(self):
+        # Views returned by position_bytes keep the map they were taken from open, in which case it
+        # is unmapped when the last of them is released rather than here.
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+        self._map = None
+
+    def _offset(self, index):
+        if not isinstance(index, int):
+            raise TypeError('position indices must be integers, not {}'.format(type(index).__name__))
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('position index out of range')
+        return HEADER_SIZE + index * RECORD_SIZE
+
+    def _require_writable(self):
+        if not self.writable:
+            raise ValueError('The position database was opened read-only')
@@ -0,0 +1,431 @@
+"""
+A chess engine search: iterative-deepening negamax with alpha-beta pruning over the board's legal
+moves, backed by a transposition table.
+
+Moves are ordered with the transposition table move first, then captures by most valuable victim /
+least valuable attacker (MVV-LVA), then killer moves, then the history heuristic. Leaf nodes are
+resolved with a quiescence search over captures and queen promotions. A search can be bounded by
+depth, time or node count, and stopped from another thread.
+
+Searching with several processes uses "lazy SMP": helper processes search the same root position
+independently, sharing one transposition table through shared memory, so that each benefits from the
+others' results. Half of the helpers start one iteration deeper, to spread the work across depths.
+The helpers are started by the first parallel search and kept, with the shared table, for the next.
+
+A Searcher given an opening book plays book moves without searching, and one given endgame
+tablebases scores the positions they cover exactly instead of searching them.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from chessington.engine.encoding import encode_move
+from chessington.engine.evaluation import PIECE_VALUES, evaluate
+from chessington.engine.pieces import Queen
+from chessington.engine.tablebase import WIN, LOSS
+from chessington.engine.transposition import (TranspositionTable, SharedTranspositionTable, EXACT, LOWER_BOUND,
+                                               UPPER_BOUND)
+
+MAX_DEPTH = 64
+MATE_SCORE = 100000
+INFINITY = 1000000
+
+# Scores beyond this are mates, stored in the transposition table relative to the node they occur at.
+_MATE_THRESHOLD = MATE_SCORE - 1000
+
+# The number of nodes between checks of the clock and stop event, kept small so that searches sharing
+# a CPU with their helpers still stop close to their deadline.
+_CHECK_INTERVAL = 256
+
+# How long helper processes are given to report, in total, once the main search finishes.
+_HELPER_REPORT_TIME = 0.05
+
+# How long to wait for each helper process to exit when the Searcher is closed.
+_HELPER_TIMEOUT = 5.0
+
+SearchResult = namedtuple('SearchResult', 'move score depth nodes seconds pv')
+
+
+class SearchAborted(Exception):
+    """
+    Raised inside the search when its time or node budget runs out, or it is stopped.
+    """
+    pass
+
+
+def _score_to_table(score, ply):
+    if score > _MATE_THRESHOLD:
+        return score + ply
+    if score < -_MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    if score > _MATE_THRESHOLD:
+        return score - ply
+    if score < -_MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+def mate_in(score):
+    """
+    The number of moves to mate given by a search score, negative if the side to move is being
+    mated, or None if the score is not a mate score.
+    """
+    if score > _MATE_THRESHOLD:
+        return (MATE_SCORE - score + 1) // 2
+    if score < -_MATE_THRESHOLD:
+        return -((MATE_SCORE + score) // 2)
+    return None
+
+
+def _tablebase_score(result, ply):
+    if result.outcome == WIN:
+        return MATE_SCORE - ply - result.distance
+    if result.outcome == LOSS:
+        return -MATE_SCORE + ply + result.distance
+    return 0
+
+
+class Searcher:
+    """
+    A reusable search engine. The transposition table and history statistics are kept between
+    searches, so one Searcher should be used per game or analysis worker. A Searcher that has run
+    parallel searches should be closed when done with, to stop its helper processes.
+    """
+
+    def __init__(self, table=None, megabytes=16, evaluate=evaluate, book=None, tablebases=None):
+        self.table = table if table is not None else TranspositionTable(megabytes)
+        self.evaluate = evaluate
+        self.book = book
+        self.tablebases = tablebases
+        self.nodes = 0
+        self._stop_event = threading.Event()
+        self._deadline = None
+        self._node_limit = None
+        self._killers = [[None, None] for _ in range(MAX_DEPTH + 1)]
+        self._history = {}
+        self._owns_table = False
+        self._helper_context = None
+        self._generation = None
+        self._helper_results = None
+        self._helpers = []
+
+    def stop(self):
+        """
+        Asks the running search, if any, to stop as soon as possible. It returns the result of the
+        deepest completed iteration.
+        """
+        self._stop_event.set()
+
+    def search(self, board, depth=None, time_limit=None, node_limit=None, info=None, processes=1,
+               stop_event=None):
+        """
+        Searches the board's position by iterative deepening until the depth (default MAX_DEPTH),
+        time limit in seconds or node limit is reached. If given, info is called with a SearchResult
+        after each completed iteration. The board is left as it was found.
+
+        With more than one process, processes - 1 helpers search alongside this one, each with the
+        same time and node limits. The result is that of the deepest completed search, and its node
+        count is the total over all processes. The first parallel search moves the transposition table
+        into shared memory and starts the helpers; later ones reuse both.
+
+        If the Searcher has an opening book and the position is in it, the most played book move is
+        returned straight away, with a depth of 0, and likewise the best move by the tablebases if
+        they cover the position.
+
+        The search stops early once stop_event, a threading.Event, is set. A caller that may stop a
+        search from another thread should create an event for each search, so that a stop asked for
+        before the search gets under way applies to it, and one that comes after it has finished does
+        not carry over to the next.
+        """
+        self._stop_event = stop_event if stop_event is not None else threading.Event()
+        if self.book is not None:
+            book_move = self.book.best_move(board)
+            if book_move is not None:
+                return SearchResult(book_move, 0, 0, 0, 0.0, [book_move])
+        if self.tablebases is not None:
+            root_result = self.tablebases.probe(board)
+            tablebase_move = self.tablebases.best_move(board) if root_result is not None else None
+            if tablebase_move is not None:
+                score = _tablebase_score(root_result, 0)
+                return SearchResult(tablebase_move, score, 0, 0, 0.0, [tablebase_move])
+        if processes > 1:
+            return self._search_parallel(board, depth, time_limit, node_limit, info, processes)
+        return self._search(board, depth, time_limit, node_limit, info)
+
+    def _search(self, board, depth, time_limit, node_limit, info, first_depth=1):
+        start = time.perf_counter()
+        self.nodes = 0
+        self._deadline = start + time_limit if time_limit is not None else None
+        self._node_limit = node_limit
+        self._killers = [[None, None] for _ in range(MAX_DEPTH + 1)]
+        self.table.new_search()
+
+        moves = board.legal_moves()
+        if not moves:
+            score = -MATE_SCORE if board.in_check() else 0
+            return SearchResult(None, score, 0, 0, 0.0, [])
+
+        result = SearchResult(moves[0], 0, 0, 0, 0.0, [moves[0]])
+        for iteration_depth in range(first_depth, min(depth or MAX_DEPTH, MAX_DEPTH) + 1):
+            try:
+                move, score = self._search_root(board, iteration_depth, moves)
+            except SearchAborted:
+                break
+            moves.remove(move)
+            moves.insert(0, move)
+            result = SearchResult(move, score, iteration_depth, self.nodes, time.perf_counter() - start,
+                                  self._principal_variation(board, move, iteration_depth))
+            if info is not None:
+                info(result)
+            if abs(score) > _MATE_THRESHOLD:
+                break
+        return result._replace(nodes=self.nodes, seconds=time.perf_counter() - start)
+
+    def close(self):
+        """
+        Stops the helper processes started by parallel searches, and frees the shared transposition
+        table if this Searcher created it. A later parallel search starts afresh.
+        """
+        for _, tasks in self._helpers:
+            tasks.put(None)
+        for helper, _ in self._helpers:
+            helper.join(_HELPER_TIMEOUT)
+        self._helpers = []
+        if self._owns_table:
+            megabytes = self.table.megabytes
+            self.table.close()
+            self.table = TranspositionTable(megabytes)
+            self._owns_table = False
+
+    def _start_helpers(self, count):
+        if not isinstance(self.table, SharedTranspositionTable):
+            self.table = SharedTranspositionTable(self.table.megabytes)
+            self._owns_table = True
+        if self._helper_context is None:
+            # Helpers are spawned rather than forked, since searches may be started from a thread of
+            # a process that has other threads running.
+            self._helper_context = multiprocessing.get_context('spawn')
+            self._generation = self._helper_context.RawValue('Q', 0)
+            self._helper_results = self._helper_context.Queue()
+        self._helpers = [(helper, tasks) for helper, tasks in self._helpers if helper.is_alive()]
+        while len(self._helpers) < count:
+            tasks = self._helper_context.Queue()
+            helper = self._helper_context.Process(target=_helper_main, daemon=True,
+                                                  args=(self.table, self._generation, tasks, self._helper_results))
+            helper.start()
+            self._helpers.append((helper, tasks))
+
+    def _search_parallel(self, board, depth, time_limit, node_limit, info, processes):
+        self._start_helpers(processes - 1)
+        self._generation.value += 1
+        generation = self._generation.value
+        for i, (_, tasks) in enumerate(self._helpers[:processes - 1]):
+            tasks.put((generation, self.table.age, board, depth, time_limit, node_limit, 1 + i % 2))
+
+        try:
+            result = self._search(board, depth, time_limit, node_limit, info)
+        finally:
+            # Moving the generation on stops the helpers, which then report their deepest results.
+            self._generation.value += 1
+            helper_results = self._collect_helper_results(generation, processes - 1)
+
+        nodes = result.nodes + sum(helper_result.nodes for helper_result in helper_results)
+        for helper_result in helper_results:
+            if helper_result.move is not None and helper_result.depth > result.depth:
+                result = helper_result
+        return result._replace(nodes=nodes)
+
+    def _collect_helper_results(self, generation, count):
+        # Reports from earlier searches that came in after they gave up waiting are discarded.
+        helper_results = []
+        cutoff = time.perf_counter() + _HELPER_REPORT_TIME
+        while len(helper_results) < count:
+            try:
+                reported_generation, result = self._helper_results.get(
+                    timeout=max(0.0, cutoff - time.perf_counter()))
+            except queue.Empty:
+                break
+            if reported_generation == generation:
+                helper_results.append(result)
+        return helper_results
+
+    def _search_root(self, board, depth, moves):
+        alpha, beta = -INFINITY, INFINITY
+        best_move = None
+        for move in moves:
+            board.make_move(move)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -alpha, 1)
+            finally:
+                board.unmake_move()
+            if score > alpha:
+                alpha, best_move = score, move
+        self.table.store(board.zobrist_key, depth, _score_to_table(alpha, 0), EXACT, best_move)
+        return best_move, alpha
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        if self.tablebases is not None:
+            result = self.tablebases.probe(board)
+            if result is not None:
+                self._count_node()
+                return _tablebase_score(result, ply)
+        if depth <= 0 or ply >= MAX_DEPTH:
+            return self._quiescence(board, alpha, beta, ply)
+        self._count_node()
+
+        key = board.zobrist_key
+        entry = self.table.probe(key)
+        tt_move = None
+        if entry is not None:
+            tt_move = entry.move
+            if entry.depth >= depth:
+                score = _score_from_table(entry.score, ply)
+                if (entry.bound == EXACT or
+                        entry.bound == LOWER_BOUND and score >= beta or
+                        entry.bound == UPPER_BOUND and score <= alpha):
+                    return score
+
+        moves = board.legal_moves()
+        if not moves:
+            return -MATE_SCORE + ply if board.in_check() else 0
+
+        original_alpha = alpha
+        best_score, best_move = -INFINITY, None
+        for move in self._order_moves(board, moves, tt_move, ply):
+            is_capture = board.get_piece(move.to_square) is not None
+            board.make_move(move)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move()
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if not is_capture:
+                            self._record_cutoff(move, depth, ply)
+                        break
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.table.store(key, depth, _score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    def _quiescence(self, board, alpha, beta, ply):
+        self._count_node()
+        stand_pat = self.evaluate(board)
+        if stand_pat >= beta or ply >= MAX_DEPTH:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        player = board.current_player
+        captures = [move for move in board.pseudo_legal_moves()
+                    if board.get_piece(move.to_square) is not None or move.promotion is Queen]
+        for move in self._order_moves(board, captures, None, ply):
+            board.make_move(move)
+            try:
+                if board.in_check(player):
+                    continue
+                score = -self._quiescence(board, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _order_moves(self, board, moves, tt_move, ply):
+        killers = self._killers[ply]
+        history = self._history
+
+        def priority(move):
+            if move == tt_move:
+                return 3 * INFINITY
+            victim = board.get_piece(move.to_square)
+            if victim is not None or move.promotion is Queen:
+                attacker = board.get_piece(move.from_square)
+                victim_value = PIECE_VALUES[type(victim)] if victim is not None else 0
+                promotion_value = PIECE_VALUES[move.promotion] if move.promotion is not None else 0
+                return 2 * INFINITY + 10 * (victim_value + promotion_value) - PIECE_VALUES[type(attacker)]
+            if move == killers[0] or move == killers[1]:
+                return INFINITY
+            return history.get(encode_move(move), 0)
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def _record_cutoff(self, move, depth, ply):
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[0], killers[1] = move, killers[0]
+        code = encode_move(move)
+        self._history[code] = min(self._history.get(code, 0) + depth * depth, INFINITY - 1)
+
+    def _count_node(self):
+        self.nodes += 1
+        if self._node_limit is not None and self.nodes > self._node_limit:
+            raise SearchAborted()
+        if self.nodes % _CHECK_INTERVAL == 0:
+            if self._stop_event.is_set() or self._deadline is not None and time.perf_counter() >= self._deadline:
+                raise SearchAborted()
+
+    def _principal_variation(self, board, first_move, depth):
+        pv = [first_move]
+        board.make_move(first_move)
+        while len(pv) < depth:
+            entry = self.table.probe(board.zobrist_key)
+            if entry is None or entry.move is None or entry.move not in board.legal_moves():
+                break
+            pv.append(entry.move)
+            board.make_move(entry.move)
+        for _ in pv:
+            board.unmake_move()
+        return pv
+
+
+class _GenerationStop:
+    """
+    Stands in for a helper's stop event, which is set once the main search moves the shared
+    generation on from that of the helper's task.
+    """
+
+    def __init__(self, generation, task_generation):
+        self.generation = generation
+        self.task_generation = task_generation
+
+    def is_set(self):
+        return self.generation.value != self.task_generation
+
+
+def _helper_main(table, generation, tasks, results):
+    searcher = Searcher(table)
+    try:
+        for task_generation, age, board, depth, time_limit, node_limit, first_depth in iter(tasks.get, None):
+            if generation.value != task_generation:
+                continue
+            table.age = age
+            searcher._stop_event = _GenerationStop(generation, task_generation)
+            result = searcher._search(board, depth, time_limit, node_limit, None, first_depth)
+            results.put((task_generation, result))
+    finally:
+        table.close()
+
+
+def search(board, depth=None, time_limit=None, node_limit=None, info=None, processes=1, stop_event=None):
+    """
+    Searches the board's position with a fresh Searcher; see Searcher.search.
+    """
+    return Searcher().search(board, depth, time_limit, node_limit, info, processes, stop_event)
@@ -0,0 +1,331 @@
+"""
+Endgame tablebases for king and queen, king and rook, and king and pawn against a lone king, built
+by retrograde analysis.
+
+A table holds the result of perfect play for every placement of the two kings and the extra piece
+with either side to move. The side with the extra piece is always white in the table; positions
+where black has it are mirrored top to bottom with the colours swapped. Positions are indexed as
+``side * 64**3 + white_king * 64**2 + black_king * 64 + piece``, with side 0 for white to move and
+squares indexed ``row * 8 + col``, so a probe is one index calculation and one array lookup.
+
+Each position is stored in one byte: 0 for a draw, 255 for an illegal position, or else one more
+than the number of halfmoves until mate. Only white can win, so with white to move a non-zero
+distance is a win and with black to move it is a loss.
+
+Tables are generated backwards from the checkmates: a white position wins in n + 1 halfmoves if it
+has a move into a black position lost in n, and a black position is lost once every one of its moves
+leads to a white win. Black's moves are counted once up front and counted down as they are found to
+lose. The king and pawn table is also seeded with the promotions into the other two tables, so the
+king and queen and king and rook tables are built first.
+"""
+
+import os
+import struct
+from collections import defaultdict, namedtuple
+
+from chessington.engine.data import BOARD_SIZE, Player
+from chessington.engine.encoding import PIECE_CODES
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine.tables import KING_MOVES, KING_ATTACKS, WHITE_PAWN_ATTACKS, ROOK_RAYS, QUEEN_RAYS, square_index
+
+WIN, DRAW, LOSS = 1, 0, -1
+
+TABLE_SIZE = 2 * 64 ** 3
+ENDINGS = {Queen: 'KQK', Rook: 'KRK', Pawn: 'KPK'}
+
+MAGIC = b'CHTB'
+VERSION = 1
+
+_HEADER_FORMAT = struct.Struct('<4sHH')
+_BLACK_TO_MOVE = 64 ** 3
+_ILLEGAL = 0xFF
+_UNRESOLVED = 0xFF
+
+TablebaseResult = namedtuple('TablebaseResult', 'outcome distance')
+
+
+def _between_masks(rays_table):
+    """
+    For each square, a map from each square a slider there attacks on an empty board to the
+    bitmask of the squares in between.
+    """
+    between = []
+    for rays in rays_table:
+        masks = {}
+        for ray in rays:
+            passed = 0
+            for square in ray:
+                target = square_index(square)
+                masks[target] = passed
+                passed |= 1 << target
+        between.append(masks)
+    return tuple(between)
+
+
+_KING_TARGETS = tuple(tuple(square_index(square) for square in squares) for squares in KING_MOVES)
+_RAY_INDEXES = {
+    piece_type: tuple(tuple(tuple(square_index(square) for square in ray) for ray in rays) for rays in rays_table)
+    for piece_type, rays_table in ((Queen, QUEEN_RAYS), (Rook, ROOK_RAYS))
+}
+_BETWEEN = {Queen: _between_masks(QUEEN_RAYS), Rook: _between_masks(ROOK_RAYS)}
+
+
+def _attacks(piece_type, piece, target, occupied):
+    if piece_type is Pawn:
+        return WHITE_PAWN_ATTACKS[piece] >> target & 1
+    between = _BETWEEN[piece_type][piece].get(target)
+    return between is not None and not between & occupied
+
+
+class Tablebase:
+    """
+    The table for one ending: two kings and a white queen, rook or pawn.
+    """
+
+    def __init__(self, piece_type, data):
+        if len(data) != TABLE_SIZE:
+            raise ValueError('A tablebase has {} entries, not {}'.format(TABLE_SIZE, len(data)))
+        self.piece_type = piece_type
+        self.data = data
+
+    @classmethod
+    def generate(cls, piece_type, queen_table=None, rook_table=None):
+        """
+        Generates the table for the given piece type by retrograde analysis. The king and pawn table
+        needs the king and queen and king and rook tables for its promotions, which are generated
+        if not given.
+        """
+        data = bytearray(TABLE_SIZE)
+        counters = bytearray(_BLACK_TO_MOVE)
+        lost = _classify_positions(piece_type, data, counters)
+        seeds = defaultdict(list)
+        if piece_type is Pawn:
+            promotion_tables = (queen_table or cls.generate(Queen), rook_table or cls.generate(Rook))
+            _seed_promotions(data, promotion_tables, seeds)
+
+        distance = 0
+        while lost or seeds:
+            won = []
+            for index in lost:
+                for predecessor in _white_predecessors(piece_type, index):
+                    if not data[predecessor]:
+                        data[predecessor] = distance + 2
+                        won.append(predecessor)
+            for predecessor in seeds.pop(distance + 1, ()):
+                if not data[predecessor]:
+                    data[predecessor] = distance + 2
+                    won.append(predecessor)
+
+            lost = []
+            for index in won:
+                for predecessor in _black_predecessors(index):
+                    if not data[predecessor]:
+                        counter = counters[predecessor - _BLACK_TO_MOVE] - 1
+                        counters[predecessor - _BLACK_TO_MOVE] = counter
+                        if not counter:
+                            data[predecessor] = distance + 3
+                            lost.append(predecessor)
+            distance += 2
+        return cls(piece_type, bytes(data))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as file:
+            magic, version, piece_code = _HEADER_FORMAT.unpack(file.read(_HEADER_FORMAT.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError('{} is not a tablebase'.format(path))
+            piece_types = {PIECE_CODES[piece_type]: piece_type for piece_type in ENDINGS}
+            return cls(piece_types[piece_code], file.read())
+
+    def save(self, path):
+        with open(path, 'wb') as file:
+            file.write(_HEADER_FORMAT.pack(MAGIC, VERSION, PIECE_CODES[self.piece_type]))
+            file.write(self.data)
+
+    def probe_index(self, index):
+        """
+        The TablebaseResult for the side to move in the position with the given index, or None if
+        the position is illegal.
+        """
+        value = self.data[index]
+        if value == _ILLEGAL:
+            return None
+        if not value:
+            return TablebaseResult(DRAW, 0)
+        return TablebaseResult(WIN if index < _BLACK_TO_MOVE else LOSS, value - 1)
+
+
+def _classify_positions(piece_type, data, counters):
+    """
+    Marks the illegal positions and returns the checkmates. Every other black position gets a count
+    of its legal moves, or _UNRESOLVED if it is stalemate or black can capture the piece, since
+    such positions can never be lost.
+    """
+    is_pawn = piece_type is Pawn
+    mates = []
+    for white_king in range(64):
+        white_zone = KING_ATTACKS[white_king]
+        for black_king in range(64):
+            base = white_king * 4096 + black_king * 64
+            if black_king == white_king or white_zone >> black_king & 1:
+                for piece in range(64):
+                    data[base + piece] = data[_BLACK_TO_MOVE + base + piece] = _ILLEGAL
+                continue
+            for piece in range(64):
+                index = base + piece
+                if piece == white_king or piece == black_king or is_pawn and not 8 <= piece < 56:
+                    data[index] = data[_BLACK_TO_MOVE + index] = _ILLEGAL
+                    continue
+                occupied = 1 << white_king | 1 << piece
+                if _attacks(piece_type, piece, black_king, occupied):
+                    data[index] = _ILLEGAL
+                    in_check = True
+                else:
+                    in_check = False
+
+                moves, can_capture = 0, False
+                for target in _KING_TARGETS[black_king]:
+                    if white_zone >> target & 1:
+                        continue
+                    if target == piece:
+                        can_capture = True
+                    elif _attacks(piece_type, piece, target, occupied):
+                        continue
+                    moves += 1
+                if moves == 0 and in_check:
+                    data[_BLACK_TO_MOVE + index] = 1
+                    mates.append(_BLACK_TO_MOVE + index)
+                counters[index] = _UNRESOLVED if moves == 0 or can_capture else moves
+    return mates
+
+
+def _seed_promotions(data, promotion_tables, seeds):
+    """
+    Finds, for each white position with a pawn that can promote, the quickest win by promoting, and
+    records the position under that distance in seeds.
+    """
+    for white_king in range(64):
+        for black_king in range(64):
+            base = white_king * 4096 + black_king * 64
+            for piece in range(48, 56):
+                promotion_square = piece + BOARD_SIZE
+                if data[base + piece] == _ILLEGAL or promotion_square in (white_king, black_king):
+                    continue
+                distances = [table.data[_BLACK_TO_MOVE + base + promotion_square] for table in promotion_tables]
+                distances = [distance for distance in distances if distance and distance != _ILLEGAL]
+                if distances:
+                    seeds[min(distances)].append(base + piece)
+
+
+def _white_predecessors(piece_type, index):
+    """
+    The white-to-move positions with a move leading to the given black-to-move position.
+    """
+    white_king, black_king, piece = index >> 12 & 63, index >> 6 & 63, index & 63
+    base = white_king * 4096 + black_king * 64
+    for square in _KING_TARGETS[white_king]:
+        if square != black_king and square != piece:
+            yield square * 4096 + black_king * 64 + piece
+    if piece_type is Pawn:
+        behind = piece - BOARD_SIZE
+        if behind >= BOARD_SIZE and behind != white_king and behind != black_king:
+            yield base + behind
+            start = behind - BOARD_SIZE
+            if 24 <= piece < 32 and start != white_king and start != black_king:
+                yield base + start
+    else:
+        for ray in _RAY_INDEXES[piece_type][piece]:
+            for square in ray:
+                if square == white_king or square == black_king:
+                    break
+                yield base + square
+
+
+def _black_predecessors(index):
+    """
+    The black-to-move positions with a move leading to the given white-to-move position.
+    """
+    white_king, black_king, piece = index >> 12 & 63, index >> 6 & 63, index & 63
+    for square in _KING_TARGETS[black_king]:
+        if square != white_king and square != piece:
+            yield _BLACK_TO_MOVE + white_king * 4096 + square * 64 + piece
+
+
+class Tablebases:
+    """
+    A set of tablebases, probed with boards.
+    """
+
+    def __init__(self, tables=()):
+        self.tables = {table.piece_type: table for table in tables}
+
+    @classmethod
+    def generate(cls):
+        """
+        Generates the king and queen, king and rook and king and pawn tables.
+        """
+        queen_table = Tablebase.generate(Queen)
+        rook_table = Tablebase.generate(Rook)
+        return cls((queen_table, rook_table, Tablebase.generate(Pawn, queen_table, rook_table)))
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Loads every table saved in the given directory.
+        """
+        return cls(Tablebase.load(os.path.join(directory, name + '.tb')) for name in ENDINGS.values()
+                   if os.path.exists(os.path.join(directory, name + '.tb')))
+
+    def save(self, directory):
+        for piece_type, table in self.tables.items():
+            table.save(os.path.join(directory, ENDINGS[piece_type] + '.tb'))
+
+    def probe(self, board):
+        """
+        The TablebaseResult for the side to move in the board's position, or None if the position
+        is not covered by a table. A position with only the two kings, or the kings and a knight or
+        bishop, is a draw.
+        """
+        count = board.piece_count()
+        if count == 2:
+            return TablebaseResult(DRAW, 0)
+        if count != 3 or board.castling_rights:
+            return None
+        white_pieces = board.pieces(Player.WHITE)
+        strong_player = Player.WHITE if len(white_pieces) == 2 else Player.BLACK
+        strong_pieces = white_pieces if strong_player == Player.WHITE else board.pieces(Player.BLACK)
+        piece = strong_pieces[0] if type(strong_pieces[0]) is not King else strong_pieces[1]
+        if type(piece) is Knight or type(piece) is Bishop:
+            return TablebaseResult(DRAW, 0)
+        table = self.tables.get(type(piece))
+        if table is None:
+            return None
+
+        mirror = 0 if strong_player == Player.WHITE else 56
+        weak_king = board.pieces(strong_player.opponent(), King)[0]
+        strong_king = board.pieces(strong_player, King)[0]
+        index = (square_index(board.find_piece(strong_king)) ^ mirror) * 4096 + \
+                (square_index(board.find_piece(weak_king)) ^ mirror) * 64 + \
+                (square_index(board.find_piece(piece)) ^ mirror)
+        if board.current_player != strong_player:
+            index += _BLACK_TO_MOVE
+        return table.probe_index(index)
+
+    def best_move(self, board):
+        """
+        The move with the best result by the tables: the fastest win, else a draw, else the slowest
+        loss. Returns None if the position, or any position after a legal move, is not covered.
+        """
+        best_move, best_key = None, None
+        for move in board.legal_moves():
+            board.make_move(move)
+            try:
+                result = self.probe(board)
+            finally:
+                board.unmake_move()
+            if result is None:
+                return None
+            key = (result.outcome, result.distance if result.outcome == LOSS else -result.distance)
+            if best_key is None or key < best_key:
+                best_move, best_key = move, key
+        return best_move
@@ -0,0 +1,75 @@
+"""
+Lookup tables used by move generation, computed once at import time. Each table is indexed by
+square index, ``row * 8 + col``, and holds either the in-bounds destination squares for a piece on
+that square or the equivalent bitmask.
+"""
+
+from chessington.engine.data import BOARD_SIZE, Square
+
+KNIGHT_OFFSETS = ((2, 1), (2, -1), (1, 2), (1, -2), (-2, 1), (-2, -1), (-1, 2), (-1, -2))
+KING_OFFSETS = ((1, 1), (1, 0), (1, -1), (0, 1), (0, -1), (-1, 1), (-1, 0), (-1, -1))
+WHITE_PAWN_CAPTURE_OFFSETS = ((1, 1), (1, -1))
+BLACK_PAWN_CAPTURE_OFFSETS = ((-1, 1), (-1, -1))
+
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def square_index(square):
+    """
+    The index of the given square in the lookup tables.
+    """
+    return square.row * BOARD_SIZE + square.col
+
+
+def _destinations(offsets):
+    return tuple(
+        tuple(Square.at(row + d_row, col + d_col) for d_row, d_col in offsets
+              if 0 <= row + d_row < BOARD_SIZE and 0 <= col + d_col < BOARD_SIZE)
+        for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)
+    )
+
+
+def _rays(directions):
+    def ray(row, col, d_row, d_col):
+        squares = []
+        row, col = row + d_row, col + d_col
+        while 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
+            squares.append(Square.at(row, col))
+            row, col = row + d_row, col + d_col
+        return tuple(squares)
+
+    return tuple(
+        tuple(r for r in (ray(row, col, d_row, d_col) for d_row, d_col in directions) if r)
+        for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)
+    )
+
+
+def _masks(destinations):
+    return tuple(sum(1 << square_index(square) for square in squares) for squares in destinations)
+
+
+KNIGHT_MOVES = _destinations(KNIGHT_OFFSETS)
+KING_MOVES = _destinations(KING_OFFSETS)
+
+KNIGHT_ATTACKS = _masks(KNIGHT_MOVES)
+KING_ATTACKS = _masks(KING_MOVES)
+
+# The squares a pawn of each colour on each square attacks. A square is attacked by a white pawn on
+# exactly the squares a black pawn on it would attack, and vice versa.
+WHITE_PAWN_CAPTURES = _destinations(WHITE_PAWN_CAPTURE_OFFSETS)
+BLACK_PAWN_CAPTURES = _destinations(BLACK_PAWN_CAPTURE_OFFSETS)
+WHITE_PAWN_ATTACKS = _masks(WHITE_PAWN_CAPTURES)
+BLACK_PAWN_ATTACKS = _masks(BLACK_PAWN_CAPTURES)
+
+# For each square, the non-empty rays leading away from it, each ordered outwards from the square.
+ROOK_RAYS = _rays(ROOK_DIRECTIONS)
+BISHOP_RAYS = _rays(BISHOP_DIRECTIONS)
+QUEEN_RAYS = tuple(rook + bishop for rook, bishop in zip(ROOK_RAYS, BISHOP_RAYS))
+
+# The same rays as bitmasks, each paired with whether it runs towards higher square indices, in which
+# case its nearest piece is the lowest set bit of the ray's occupancy rather than the highest.
+ROOK_RAY_MASKS = tuple(tuple((_masks((ray,))[0], square_index(ray[0]) > index) for ray in rays)
+                       for index, rays in enumerate(ROOK_RAYS))
+BISHOP_RAY_MASKS = tuple(tuple((_masks((ray,))[0], square_index(ray[0]) > index) for ray in rays)
+                         for index, rays in enumerate(BISHOP_RAYS))
@@ -0,0 +1,162 @@
+"""
+A fixed-size transposition table, caching search results keyed by Zobrist position key.
+
+The table is a preallocated array of 64-bit words, so its memory footprint is fixed by the budget it
+is created with. It is divided into buckets of two entries: the first keeps the deepest result seen
+for the current search, and the second is always replaced. Each entry is a key word and a data word
+packing the best move (16 bits), depth (8 bits), bound type (2 bits), search age (6 bits) and
+score (32 bits).
+
+The key word holds the position key XORed with the data word. A probe only matches if the two words
+still XOR back to the key, so an entry torn by concurrent writers is discarded rather than trusted.
+This lets SharedTranspositionTable be shared between processes without any locking.
+"""
+
+import os
+from array import array
+from collections import namedtuple
+
+from chessington.engine.encoding import encode_move, decode_move
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 1, 2, 3
+
+ENTRY_SIZE = 16
+ENTRIES_PER_BUCKET = 2
+WORDS_PER_BUCKET = 2 * ENTRIES_PER_BUCKET
+
+_SCORE_OFFSET = 1 << 31
+_AGE_MASK = 0x3F
+
+TTEntry = namedtuple('TTEntry', 'depth score bound move')
+
+
+def table_bytes(megabytes):
+    """
+    The number of bytes used by a table with the given budget: the largest power-of-two number of
+    buckets that fits.
+    """
+    buckets = 1
+    while buckets * 2 * ENTRY_SIZE * ENTRIES_PER_BUCKET <= megabytes * 1024 * 1024:
+        buckets *= 2
+    return buckets * ENTRY_SIZE * ENTRIES_PER_BUCKET
+
+
+def _pack(depth, score, bound, age, move_code):
+    return move_code | depth << 16 | bound << 24 | age << 26 | (score + _SCORE_OFFSET) << 32
+
+
+class TranspositionTable:
+    """
+    A transposition table occupying at most the given number of megabytes. If a buffer is given, the
+    table is stored in it instead; its size must be one returned by table_bytes.
+    """
+
+    def __init__(self, megabytes=16, buffer=None):
+        if buffer is None:
+            self._words = array('Q', [0]) * (table_bytes(megabytes) // 8)
+        else:
+            self._words = memoryview(buffer).cast('Q')
+        buckets = len(self._words) // WORDS_PER_BUCKET
+        self._bucket_mask = (1 << buckets.bit_length() - 1) - 1
+        self.age = 0
+
+    @property
+    def size(self):
+        """
+        The number of entries the table can hold.
+        """
+        return (self._bucket_mask + 1) * ENTRIES_PER_BUCKET
+
+    @property
+    def megabytes(self):
+        """
+        The memory budget, in whole megabytes, that the table fits.
+        """
+        return max(1, self.size * ENTRY_SIZE // (1024 * 1024))
+
+    def new_search(self):
+        """
+        Marks the start of a new search, so that results from previous searches are replaced first.
+        """
+        self.age = (self.age + 1) & _AGE_MASK
+
+    def clear(self):
+        self._words[:] = array('Q', [0]) * len(self._words)
+
+    def store(self, key, depth, score, bound, move):
+        """
+        Records a search result for the position with the given key.
+        """
+        words = self._words
+        base = (key & self._bucket_mask) * WORDS_PER_BUCKET
+        data = _pack(depth, score, bound, self.age, encode_move(move))
+        stored_data = words[base + 1]
+        if (words[base] ^ stored_data == key or stored_data >> 26 & _AGE_MASK != self.age
+                or depth >= stored_data >> 16 & 0xFF or not stored_data):
+            words[base], words[base + 1] = key ^ data, data
+        else:
+            words[base + 2], words[base + 3] = key ^ data, data
+
+    def probe(self, key):
+        """
+        Looks up the position with the given key, returning a TTEntry or None if it is not stored.
+        """
+        words = self._words
+        base = (key & self._bucket_mask) * WORDS_PER_BUCKET
+        for offset in (0, 2):
+            data = words[base + offset + 1]
+            if data and words[base + offset] ^ data == key:
+                return TTEntry(data >> 16 & 0xFF, (data >> 32) - _SCORE_OFFSET, data >> 24 & 0x3,
+                               decode_move(data & 0xFFFF))
+        return None
+
+    def hashfull(self):
+        """
+        The proportion of entries, per thousand, filled during the current search.
+        """
+        sample = min(self.size, 1000)
+        used = sum(1 for i in range(sample)
+                   if self._words[2 * i + 1] and self._words[2 * i + 1] >> 26 & _AGE_MASK == self.age)
+        return used * 1000 // sample
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    A transposition table held in named shared memory, so that several processes can read and write
+    the same entries. Pickling a shared table (for example, as an argument to a new process) attaches
+    to the same memory on the other side. Shared tables need Python 3.8 or later.
+    """
+
+    def __init__(self, megabytes=16, name=None):
+        # Imported here so that the plain table, and everything using it, still works on Python 3.7.
+        from multiprocessing import shared_memory
+
+        if name is None:
+            self._memory = shared_memory.SharedMemory(create=True, size=table_bytes(megabytes))
+            self._owner_pid = os.getpid()
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+            self._owner_pid = None
+        super().__init__(buffer=self._memory.buf)
+
+    @property
+    def name(self):
+        return self._memory.name
+
+    def __reduce__(self):
+        return _attach_shared_table, (self.name, self.age)
+
+    def close(self):
+        """
+        Detaches this process from the shared memory, freeing it if this is the process that created it.
+        """
+        self._words.release()
+        self._memory.close()
+        if self._owner_pid == os.getpid():
+            self._memory.unlink()
+
+
+def _attach_shared_table(name, age):
+    table = SharedTranspositionTable(name=name)
+    table.age = age
+    return table
@@ -0,0 +1,236 @@
+"""
+A headless engine speaking the Universal Chess Interface (UCI) protocol over standard input and
+output, for running under match runners and tournament managers.
+
+Commands are read one line at a time. Searches run on a background thread, so that stop, isready and
+quit are answered while the engine thinks, and report an info line with the depth, score, node count,
+speed and principal variation after each iteration.
+"""
+
+import argparse
+import os
+import sys
+import threading
+
+from chessington.engine.bitboard import BitBoard
+from chessington.engine.board import Board, FEN_LETTERS, STARTING_FEN
+from chessington.engine.data import Player
+from chessington.engine.search import Searcher, mate_in
+
+ENGINE_NAME = 'Chessington'
+ENGINE_AUTHOR = 'the Chessington authors'
+
+DEFAULT_HASH_MEGABYTES = 16
+MAX_HASH_MEGABYTES = 4096
+MAX_THREADS = os.cpu_count() or 1
+
+# Without a moves-to-go count, the remaining time is shared out as if this many moves were left.
+DEFAULT_MOVES_TO_GO = 30
+# Time kept back from every move, in milliseconds, for communication with the match runner.
+MOVE_OVERHEAD_MS = 50
+
+_GO_PARAMETERS = ('wtime', 'btime', 'winc', 'binc', 'movestogo', 'depth', 'nodes', 'movetime')
+
+
+def format_move(move):
+    """
+    Writes a move in UCI long algebraic notation, such as 'e2e4' or 'e7e8q'.
+    """
+    text = move.from_square.name + move.to_square.name
+    return text + FEN_LETTERS[move.promotion] if move.promotion is not None else text
+
+
+def parse_move(board, text):
+    """
+    Finds the legal move in the board's position written in UCI long algebraic notation. Raises
+    ValueError if there is none.
+    """
+    for move in board.legal_moves():
+        if format_move(move) == text:
+            return move
+    raise ValueError('Illegal move: {}'.format(text))
+
+
+def time_limit(board, parameters):
+    """
+    The time in seconds to spend on a move given the parameters of a go command, or None if the
+    search is not limited by time.
+    """
+    if 'movetime' in parameters:
+        return max(0, parameters['movetime'] - MOVE_OVERHEAD_MS) / 1000
+    white = board.current_player == Player.WHITE
+    remaining = parameters.get('wtime' if white else 'btime')
+    if remaining is None:
+        return None
+    increment = parameters.get('winc' if white else 'binc', 0)
+    budget = remaining / (parameters.get('movestogo') or DEFAULT_MOVES_TO_GO) + increment * 0.8
+    return max(1, min(budget, remaining - MOVE_OVERHEAD_MS)) / 1000
+
+
+class UciEngine:
+    """
+    The state of a UCI session: the current position, the engine options and any running search.
+    """
+
+    def __init__(self, output=sys.stdout, board_class=Board):
+        self.output = output
+        self.board_class = board_class
+        self.board = board_class.at_starting_position()
+        self.hash_megabytes = DEFAULT_HASH_MEGABYTES
+        self.threads = 1
+        self.searcher = Searcher(megabytes=self.hash_megabytes)
+        self._output_lock = threading.Lock()
+        self._search_thread = None
+        self._search_stop = None
+
+    def run(self, input=sys.stdin):
+        """
+        Handles commands from the input until quit or the end of the input.
+        """
+        for line in input:
+            if not self.handle(line):
+                break
+        self.stop()
+        self.searcher.close()
+
+    def handle(self, line):
+        """
+        Handles a single command, returning False if it was quit. Unknown commands are ignored.
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, arguments = tokens[0], tokens[1:]
+        if command == 'uci':
+            self.send('id name {}'.format(ENGINE_NAME))
+            self.send('id author {}'.format(ENGINE_AUTHOR))
+            self.send('option name Hash type spin default {} min 1 max {}'.format(DEFAULT_HASH_MEGABYTES,
+                                                                                 MAX_HASH_MEGABYTES))
+            self.send('option name Threads type spin default 1 min 1 max {}'.format(MAX_THREADS))
+            self.send('uciok')
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'setoption':
+            self.set_option(arguments)
+        elif command == 'ucinewgame':
+            self.stop()
+            self.searcher.close()
+            self.searcher = Searcher(megabytes=self.hash_megabytes)
+        elif command == 'position':
+            self.stop()
+            self.set_position(arguments)
+        elif command == 'go':
+            self.go(arguments)
+        elif command == 'stop':
+            self.stop()
+        elif command == 'quit':
+            self.stop()
+            return False
+        return True
+
+    def send(self, line):
+        with self._output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def set_option(self, arguments):
+        if 'name' not in arguments or 'value' not in arguments:
+            return
+        name = ' '.join(arguments[arguments.index('name') + 1:arguments.index('value')]).lower()
+        value = ' '.join(arguments[arguments.index('value') + 1:])
+        try:
+            if name == 'hash':
+                self.hash_megabytes = min(max(1, int(value)), MAX_HASH_MEGABYTES)
+                self.stop()
+                self.searcher.close()
+                self.searcher = Searcher(megabytes=self.hash_megabytes)
+            elif name == 'threads':
+                self.threads = min(max(1, int(value)), MAX_THREADS)
+        except ValueError:
+            self.send('info string Invalid value for {}: {}'.format(name, value))
+
+    def set_position(self, arguments):
+        """
+        Sets up the position from the arguments of a position command: 'startpos' or 'fen' and a FEN,
+        optionally followed by 'moves' and the moves played since.
+        """
+        moves_index = arguments.index('moves') if 'moves' in arguments else len(arguments)
+        try:
+            if arguments[:1] == ['startpos']:
+                board = self.board_class.from_fen(STARTING_FEN)
+            elif arguments[:1] == ['fen']:
+                board = self.board_class.from_fen(' '.join(arguments[1:moves_index]))
+            else:
+                raise ValueError('Invalid position: {}'.format(' '.join(arguments)))
+            for text in arguments[moves_index + 1:]:
+                board.make_move(parse_move(board, text))
+        except ValueError as error:
+            self.send('info string {}'.format(error))
+            return
+        self.board = board
+
+    def go(self, arguments):
+        """
+        Starts a search of the current position with the limits in the arguments of a go command. The
+        best move is sent when the search finishes, or with go infinite once it is stopped.
+        """
+        self.stop()
+        parameters = {}
+        for name, value in zip(arguments, arguments[1:]):
+            if name in _GO_PARAMETERS:
+                try:
+                    parameters[name] = int(value)
+                except ValueError:
+                    pass
+        infinite = 'infinite' in arguments
+        limit = None if infinite else time_limit(self.board, parameters)
+        board = self.board_class.from_fen(self.board.to_fen())
+        # The same event stops the search and, with go infinite, releases its best move.
+        stop_event = self._search_stop = threading.Event()
+
+        def run():
+            result = self.searcher.search(board, parameters.get('depth'), limit, parameters.get('nodes'),
+                                          self.send_info, self.threads, stop_event)
+            if infinite:
+                stop_event.wait()
+            self.send('bestmove {}'.format(format_move(result.move) if result.move is not None else '0000'))
+
+        self._search_thread = threading.Thread(target=run, daemon=True)
+        self._search_thread.start()
+
+    def send_info(self, result):
+        mate = mate_in(result.score)
+        score = 'mate {}'.format(mate) if mate is not None else 'cp {}'.format(result.score)
+        nodes_per_second = int(result.nodes / result.seconds) if result.seconds else 0
+        self.send('info depth {} score {} nodes {} nps {} time {} pv {}'.format(
+            result.depth, score, result.nodes, nodes_per_second, int(result.seconds * 1000),
+            ' '.join(format_move(move) for move in result.pv)))
+
+    def wait(self):
+        """
+        Waits for any running search to finish of its own accord.
+        """
+        if self._search_thread is not None:
+            self._search_thread.join()
+
+    def stop(self):
+        """
+        Stops any running search and waits for it to send its best move.
+        """
+        if self._search_thread is not None:
+            self._search_stop.set()
+            self._search_thread.join()
+            self._search_thread = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the engine as a UCI engine on standard input and output.')
+    parser.add_argument('--bitboard', action='store_true', help='use the bitboard representation')
+    args = parser.parse_args(argv)
+
+    UciEngine(sys.stdout, BitBoard if args.bitboard else Board).run(sys.stdin)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
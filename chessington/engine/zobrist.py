@@ -0,0 +1,58 @@
+"""
+Zobrist hashing of board positions. Every (player, piece type, square) combination, and the side to
+move, has a fixed random 64-bit key; a position's key is the XOR of the keys of everything in it,
+so it can be updated incrementally as pieces are placed and removed. Castling rights and the en
+passant file are hashed too.
+"""
+
+import random
+
+from chessington.engine.data import BOARD_SIZE, Player
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+_random = random.Random(0xC4E55)
+
+PIECE_KEYS = {
+    player: {
+        piece_type: tuple(_random.getrandbits(64) for _ in range(BOARD_SIZE * BOARD_SIZE))
+        for piece_type in (Pawn, Knight, Bishop, Rook, Queen, King)
+    }
+    for player in Player
+}
+
+BLACK_TO_MOVE_KEY = _random.getrandbits(64)
+
+_CASTLING_RIGHT_KEYS = tuple(_random.getrandbits(64) for _ in range(4))
+
+# Keyed by the whole castling rights bitfield: the XOR of the keys of each right held.
+CASTLING_KEYS = tuple(
+    _CASTLING_RIGHT_KEYS[0] * (rights & 1) ^ _CASTLING_RIGHT_KEYS[1] * (rights >> 1 & 1) ^
+    _CASTLING_RIGHT_KEYS[2] * (rights >> 2 & 1) ^ _CASTLING_RIGHT_KEYS[3] * (rights >> 3 & 1)
+    for rights in range(16)
+)
+
+EN_PASSANT_KEYS = tuple(_random.getrandbits(64) for _ in range(BOARD_SIZE))
+
+
+def piece_key(piece, square):
+    """
+    The key for the given piece standing on the given square.
+    """
+    return PIECE_KEYS[piece.player][type(piece)][square.row * BOARD_SIZE + square.col]
+
+
+def compute_key(board):
+    """
+    Computes the key of the board's position from scratch. Board maintains the same value
+    incrementally as board.zobrist_key; this is for initialisation and verification.
+    """
+    key = BLACK_TO_MOVE_KEY if board.current_player == Player.BLACK else 0
+    key ^= CASTLING_KEYS[board.castling_rights]
+    if board.en_passant_file is not None:
+        key ^= EN_PASSANT_KEYS[board.en_passant_file]
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE):
+            piece = board.board[row][col]
+            if piece is not None:
+                key ^= PIECE_KEYS[piece.player][type(piece)][row * BOARD_SIZE + col]
+    return key
@@ -1,13 +1,22 @@
 """
 A GUI chess board that can be interacted with, and pieces moved around on.
+
+After each click only the squares that can have changed are redrawn: those the last move touched and
+those whose highlight changed. Element handles and piece image paths are looked up once up front.
+
+The engine can be asked to play the side to move. It searches on a background thread, with helper
+processes on the remaining cores, while the window keeps handling events; its progress is collected
+on an event loop timeout and shown below the board.
 """
 
 import os
 
 import PySimpleGUI as psg
 
-from chessington.engine.board import Board, BOARD_SIZE
+from chessington.engine.background import BackgroundSearch
+from chessington.engine.board import Board, BOARD_SIZE, CASTLING_ROOK_MOVES
 from chessington.engine.data import Player, Square
+from chessington.engine.notation import move_to_san
 from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
 
 IMAGES_BASE_DIRECTORY = 'images'
@@ -17,13 +26,31 @@ WHITE_SQUARE_COLOUR = '#F0D9B5'
 FROM_SQUARE_COLOUR = '#33A1FF'
 TO_SQUARE_COLOUR = '#B633FF'
 
-def get_image_name_from_piece(piece):
-    if piece is None:
-        return os.path.join(IMAGES_BASE_DIRECTORY, 'blank.png')
+ENGINE_TIME_LIMIT = 10
+ENGINE_PROCESSES = max(1, (os.cpu_count() or 1) - 1)
+POLL_INTERVAL_MS = 100
+
+ENGINE_MOVE_BUTTON = 'Engine move'
+MOVE_NOW_BUTTON = 'Move now'
+CANCEL_BUTTON = 'Cancel'
+INFO_KEY = 'info'
+
+BLANK_IMAGE = os.path.join(IMAGES_BASE_DIRECTORY, 'blank.png')
+
+def _piece_images():
     class_to_piece_name = { Pawn: 'pawn', Knight: 'knight', Bishop: 'bishop', Rook: 'rook', Queen: 'queen', King: 'king' }
     player_to_colour_suffix = { Player.WHITE: 'w', Player.BLACK: 'b' }
-    image_name = class_to_piece_name[piece.__class__] + player_to_colour_suffix[piece.player] + '.png'
-    return os.path.join(IMAGES_BASE_DIRECTORY, image_name)
+    return {(piece_class, player): os.path.join(IMAGES_BASE_DIRECTORY, piece_name + suffix + '.png')
+            for piece_class, piece_name in class_to_piece_name.items()
+            for player, suffix in player_to_colour_suffix.items()}
+
+# The image file for each (piece class, player) pair.
+PIECE_IMAGES = _piece_images()
+
+def get_image_name_from_piece(piece):
+    if piece is None:
+        return BLANK_IMAGE
+    return PIECE_IMAGES[piece.__class__, piece.player]
 
 def get_key_from_square(square):
     return (square.row, square.col)
@@ -41,48 +68,90 @@ def render_square(board, square):
 def render_board(board):
     return [[render_square(board, Square.at(row, col)) for col in range(BOARD_SIZE)] for row in range(BOARD_SIZE - 1, -1, -1)]
 
-def update_pieces(window, board):
-    for row in range(BOARD_SIZE):
-        for col in range(BOARD_SIZE):
-            image_file = get_image_name_from_piece(board.get_piece(Square.at(row, col)))
-            element = window.FindElement(key=(row, col))
-            element.Update(image_filename=image_file)
-
-def set_square_colour(window, square, colour):
-    element = window.FindElement(key=(square.row, square.col))
-    element.Update(button_color=('white', colour))
-
-def reset_square_colours(window):
-    for row in range(BOARD_SIZE):
-        for col in range(BOARD_SIZE):
-            colour = get_square_colour(Square.at(row, col))
-            element = window.FindElement(key=(row, col))
-            element.Update(button_color=('white', colour))
-
-def highlight_squares(window, from_square, to_squares):
-    reset_square_colours(window)
-    if from_square is not None:
-        set_square_colour(window, from_square, FROM_SQUARE_COLOUR)
-    for square in to_squares:
-        set_square_colour(window, square, TO_SQUARE_COLOUR)
+def render_controls():
+    return [[psg.Text('', size=(60, 1), key=INFO_KEY)],
+            [psg.Button(ENGINE_MOVE_BUTTON), psg.Button(MOVE_NOW_BUTTON), psg.Button(CANCEL_BUTTON)]]
+
+def format_search_info(board, result):
+    """
+    Describes a search result for the board's position: its depth, score, speed and best line.
+    """
+    nodes_per_second = int(result.nodes / result.seconds) if result.seconds else 0
+    line_board = Board.from_fen(board.to_fen())
+    line = []
+    for move in result.pv:
+        line.append(move_to_san(line_board, move))
+        line_board.make_move(move)
+    return 'Depth {}  score {}  {} nodes/s  {}'.format(result.depth, result.score, nodes_per_second, ' '.join(line))
+
+def get_move_squares(board, from_square, to_square):
+    """
+    The squares whose contents can change when the piece on from_square moves to to_square: the
+    two squares themselves, the square of a pawn captured en passant and a castling rook's squares.
+    """
+    squares = [from_square, to_square, Square.at(from_square.row, to_square.col)]
+    if isinstance(board.get_piece(from_square), King):
+        squares.extend(CASTLING_ROOK_MOVES.get(to_square, ()))
+    return squares
+
+class BoardView:
+    """
+    The squares of a window's board, remembering what each one shows so that only changes are redrawn.
+    """
+
+    def __init__(self, window, board):
+        keys = [(row, col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)]
+        self.elements = {key: window.FindElement(key=key) for key in keys}
+        self.images = {key: get_image_name_from_piece(board.get_piece(Square.at(*key))) for key in keys}
+        self.colours = {key: get_square_colour(Square.at(*key)) for key in keys}
+        self.highlighted = set()
+
+    def update_pieces(self, board, squares):
+        for square in squares:
+            key = get_key_from_square(square)
+            image_file = get_image_name_from_piece(board.get_piece(square))
+            if self.images[key] != image_file:
+                self.elements[key].Update(image_filename=image_file)
+                self.images[key] = image_file
+
+    def highlight_squares(self, from_square, to_squares):
+        colours = {square: TO_SQUARE_COLOUR for square in to_squares}
+        if from_square is not None:
+            colours[from_square] = FROM_SQUARE_COLOUR
+        for square in self.highlighted | set(colours):
+            self._set_colour(square, colours.get(square) or get_square_colour(square))
+        self.highlighted = set(colours)
+
+    def _set_colour(self, square, colour):
+        key = get_key_from_square(square)
+        if self.colours[key] != colour:
+            self.elements[key].Update(button_color=('white', colour))
+            self.colours[key] = colour
 
 def play_game():
     psg.ChangeLookAndFeel('GreenTan')
 
     board = Board.at_starting_position()
-    board_layout = render_board(board)
+    board_layout = render_board(board) + render_controls()
     window = psg.Window('Chessington', default_button_element_size=(12, 1), auto_size_buttons=False).Layout(board_layout)
+    window.Finalize()
+    view = BoardView(window, board)
+    info_element = window.FindElement(INFO_KEY)
+    engine = BackgroundSearch()
 
     from_square = None
     to_squares = []
+    changed_squares = []
+    thinking = False
 
     def handle_click(row, col):
 
-        nonlocal window, board, from_square, to_squares
+        nonlocal window, board, from_square, to_squares, changed_squares
         clicked_piece = board.get_piece(Square.at(row, col))
 
         # If making an allowed move, then make it
         if from_square is not None and any(s.row == row and s.col == col for s in to_squares):
+            changed_squares = get_move_squares(board, from_square, Square.at(row, col))
             board.get_piece(from_square).move_to(board, Square.at(row, col))
             from_square, to_squares = None, []
 
@@ -95,14 +164,45 @@ def play_game():
         else:
             from_square, to_squares = None, []
 
+    def handle_search_event(event):
+
+        nonlocal thinking, changed_squares
+        info_element.Update(format_search_info(board, event.result))
+        if event.finished:
+            thinking = False
+            move = event.result.move
+            if not engine.cancelled and move is not None:
+                changed_squares = get_move_squares(board, move.from_square, move.to_square)
+                board.make_move(move)
+
     while True:
 
-        # Check for a square being clicked on and react appropriately
-        button, _ = window.Read()
-        if button is not None:
-            handle_click(*button)
+        # Wait for a click, waking up regularly to collect the engine's progress while it thinks
+        button, _ = window.Read(timeout=POLL_INTERVAL_MS if thinking else None)
+        if button is None:
+            engine.close()
+            break
+
+        # Check for a square being clicked on and react appropriately; the board is locked while the engine thinks
+        if isinstance(button, tuple):
+            if not thinking:
+                handle_click(*button)
+        elif button == ENGINE_MOVE_BUTTON and not thinking:
+            from_square, to_squares = None, []
+            engine.start(board, time_limit=ENGINE_TIME_LIMIT, processes=ENGINE_PROCESSES)
+            thinking = True
+        elif button == MOVE_NOW_BUTTON:
+            engine.stop()
+        elif button == CANCEL_BUTTON:
+            engine.cancel()
+
+        for event in engine.poll():
+            handle_search_event(event)
 
         # Update the UI
-        highlight_squares(window, from_square, to_squares)
-        update_pieces(window, board)
+        view.highlight_squares(from_square, to_squares)
+        view.update_pieces(board, changed_squares)
+        changed_squares = []
+
+    window.Close()
 
@@ -0,0 +1,35 @@
+from chessington.engine.background import BackgroundSearch
+from chessington.engine.board import Board
+from chessington.engine.data import Move, Square
+
+def test_background_search_posts_progress_then_the_result():
+
+    # Arrange
+    background = BackgroundSearch()
+    board = Board.from_fen('4k3/8/8/3q4/8/2N5/8/4K3 w - - 0 1')
+
+    # Act
+    background.start(board, depth=3)
+    finished = background.wait(10)
+    events = background.poll()
+
+    # Assert
+    assert finished
+    assert [event.finished for event in events] == [False, False, False, True]
+    assert events[-1].result.move == Move(Square.at(2, 2), Square.at(4, 3))
+    assert board.to_fen() == '4k3/8/8/3q4/8/2N5/8/4K3 w - - 0 1'
+
+def test_cancelled_search_stops_early():
+
+    # Arrange
+    background = BackgroundSearch()
+
+    # Act
+    background.start(Board.at_starting_position(), time_limit=30)
+    background.cancel()
+    finished = background.wait(10)
+
+    # Assert
+    assert finished
+    assert background.cancelled
+    assert background.poll()[-1].finished
@@ -0,0 +1,47 @@
+import pytest
+
+from chessington.engine.batch import analyse_batch
+from chessington.engine.board import Board
+from chessington.engine.data import Move, Square
+from chessington.engine.search import search
+
+FENS = [
+    '6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1',
+    '4k3/8/8/3q4/8/2N5/8/4K3 w - - 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1',
+    '4k3/8/8/8/8/8/4P3/4K3 b - - 0 1',
+    '4k3/8/8/3Q4/8/8/8/4K3 b - - 0 1',
+]
+
+def test_batch_results_match_single_process_search():
+
+    # Arrange
+    boards = [Board.from_fen(fen) for fen in FENS]
+
+    # Act
+    results = list(analyse_batch(boards, depth=2, processes=2, chunk_size=2))
+
+    # Assert
+    assert [result.index for result in results] == list(range(len(FENS)))
+    for result, fen in zip(results, FENS):
+        expected = search(Board.from_fen(fen), depth=2)
+        assert result.score == expected.score
+        assert result.depth == 2
+    assert results[0].move == Move(Square.at(0, 0), Square.at(7, 0))
+
+def test_unordered_batch_returns_every_position():
+
+    # Arrange
+    boards = (Board.from_fen(fen) for fen in FENS)
+
+    # Act
+    results = list(analyse_batch(boards, depth=1, processes=2, chunk_size=1, ordered=False))
+
+    # Assert
+    assert sorted(result.index for result in results) == list(range(len(FENS)))
+
+def test_batch_needs_a_search_limit():
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        list(analyse_batch([Board.at_starting_position()]))
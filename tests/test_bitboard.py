@@ -0,0 +1,95 @@
+import pytest
+
+from chessington.engine.bitboard import BitBoard, square_bit, mask_squares
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square
+from chessington.engine.pieces import Pawn, Knight
+
+def test_starting_position_occupies_first_and_last_two_rows():
+
+    # Arrange
+    board = BitBoard.at_starting_position()
+
+    # Assert
+    assert board.player_masks[Player.WHITE] == 0xFFFF
+    assert board.player_masks[Player.BLACK] == 0xFFFF << 48
+    assert board.occupied == 0xFFFF00000000FFFF
+
+def test_moving_a_piece_updates_masks():
+
+    # Arrange
+    board = BitBoard.at_starting_position()
+    from_square = Square.at(1, 4)
+    to_square = Square.at(3, 4)
+
+    # Act
+    board.move_piece(from_square, to_square)
+
+    # Assert
+    assert board.emptySquare(from_square)
+    assert board.fullSquare(to_square)
+    assert board.pieces_mask(Player.WHITE, Pawn) & square_bit(to_square)
+    assert not board.pieces_mask(Player.WHITE, Pawn) & square_bit(from_square)
+
+def test_captures_clear_the_captured_piece_mask():
+
+    # Arrange
+    board = BitBoard.empty()
+    knight = Knight(Player.WHITE)
+    board.set_piece(Square.at(3, 3), knight)
+    board.set_piece(Square.at(5, 4), Pawn(Player.BLACK))
+
+    # Act
+    board.move_piece(Square.at(3, 3), Square.at(5, 4))
+
+    # Assert
+    assert board.player_masks[Player.BLACK] == 0
+    assert board.pieces_mask(Player.WHITE, Knight) == square_bit(Square.at(5, 4))
+    assert board.find_piece(knight) == Square.at(5, 4)
+
+def test_pieces_generate_the_same_moves_on_a_bitboard():
+
+    # Arrange
+    board = BitBoard.empty()
+    pawn = Pawn(Player.WHITE)
+    board.set_piece(Square.at(1, 4), pawn)
+    board.set_piece(Square.at(3, 4), Pawn(Player.BLACK))
+
+    # Act
+    moves = pawn.get_available_moves(board)
+
+    # Assert
+    assert moves == [Square.at(2, 4)]
+
+def test_mask_squares_lists_the_set_bits_in_order():
+
+    # Arrange
+    mask = square_bit(Square.at(7, 7)) | square_bit(Square.at(0, 1)) | square_bit(Square.at(3, 4))
+
+    # Act
+    squares = mask_squares(mask)
+
+    # Assert
+    assert squares == [Square.at(0, 1), Square.at(3, 4), Square.at(7, 7)]
+
+@pytest.mark.parametrize('fen', [
+    '4k3/8/8/8/8/8/4r3/4K3 w - - 0 1',
+    '4k3/8/8/1b6/8/8/4R3/r3K3 w - - 0 1',
+    '4k3/4r3/8/8/8/5n2/8/4K3 w - - 0 1',
+    '4k3/8/8/8/1b6/8/3N4/4K3 w - - 0 1',
+    '8/8/8/KPp4r/8/8/8/7k w - c6 0 2',
+    '4k3/8/8/2Pp4/8/8/8/4K3 w - d6 0 2',
+    '7k/8/8/8/8/8/1p6/R3K3 b Q - 0 1',
+], ids=['check', 'double-check', 'knight-and-rook-check', 'pin', 'en-passant-pin', 'en-passant', 'promotion'])
+def test_legal_moves_match_board(fen):
+
+    # Arrange
+    board = Board.from_fen(fen)
+    bitboard = BitBoard.from_fen(fen)
+
+    # Act
+    moves = bitboard.legal_moves()
+
+    # Assert
+    assert len(moves) == len(set(moves))
+    assert set(moves) == set(board.legal_moves())
@@ -1,5 +1,9 @@
-from chessington.engine.board import Board
-from chessington.engine.data import Player, Square
+import pytest
+
+from chessington.engine.bitboard import BitBoard
+from chessington.engine.board import Board, STARTING_FEN
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.pieces import Pawn, Knight, Rook, Queen, King
 
 def test_new_board_has_white_pieces_at_bottom():
 
@@ -35,4 +39,298 @@ def test_pieces_can_be_moved_on_the_board():
     board.move_piece(from_square, to_square)
 
     assert board.get_piece(from_square) is None
-    assert board.get_piece(to_square) is piece
\ No newline at end of file
+    assert board.get_piece(to_square) is piece
+
+def test_find_piece_follows_moved_piece():
+
+    # Arrange
+    board = Board.at_starting_position()
+    from_square = Square.at(1, 4)
+    piece = board.get_piece(from_square)
+
+    # Act
+    to_square = Square.at(3, 4)
+    board.move_piece(from_square, to_square)
+
+    # Assert
+    assert board.find_piece(piece) == to_square
+
+def test_captured_pieces_are_removed_from_piece_lists():
+
+    # Arrange
+    board = Board.empty()
+    knight = Knight(Player.WHITE)
+    board.set_piece(Square.at(3, 3), knight)
+    enemy = Pawn(Player.BLACK)
+    board.set_piece(Square.at(5, 4), enemy)
+
+    # Act
+    board.move_piece(Square.at(3, 3), Square.at(5, 4))
+
+    # Assert
+    assert board.pieces(Player.BLACK) == []
+    assert board.pieces(Player.WHITE, Knight) == [knight]
+
+def test_starting_position_has_twenty_legal_moves():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    moves = board.legal_moves()
+
+    # Assert
+    assert len(moves) == 20
+    assert Move(Square.at(1, 4), Square.at(3, 4)) in moves
+
+def test_unmake_move_restores_the_board():
+
+    # Arrange
+    board = Board.empty()
+    knight = Knight(Player.WHITE)
+    enemy = Pawn(Player.BLACK)
+    board.set_piece(Square.at(3, 3), knight)
+    board.set_piece(Square.at(5, 4), enemy)
+
+    # Act
+    board.make_move(Move(Square.at(3, 3), Square.at(5, 4)))
+    board.unmake_move()
+
+    # Assert
+    assert board.get_piece(Square.at(3, 3)) is knight
+    assert board.get_piece(Square.at(5, 4)) is enemy
+    assert board.find_piece(enemy) == Square.at(5, 4)
+    assert not knight.moved
+    assert board.current_player == Player.WHITE
+
+def test_legal_moves_do_not_leave_king_in_check():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(0, 4), King(Player.WHITE))
+    board.set_piece(Square.at(1, 4), Rook(Player.WHITE))
+    board.set_piece(Square.at(7, 4), Rook(Player.BLACK))
+
+    # Act
+    moves = board.legal_moves()
+
+    # Assert
+    rook_moves = [move for move in moves if move.from_square == Square.at(1, 4)]
+    assert all(move.to_square.col == 4 for move in rook_moves)
+    assert Move(Square.at(1, 4), Square.at(7, 4)) in rook_moves
+
+def test_starting_position_round_trips_through_fen():
+
+    # Arrange
+    board = Board.from_fen(STARTING_FEN)
+
+    # Act
+    fen = board.to_fen()
+
+    # Assert
+    assert fen == STARTING_FEN
+    assert board.zobrist_key == Board.at_starting_position().zobrist_key
+
+def test_fen_records_side_to_move_and_clocks():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    board.move_piece(Square.at(1, 4), Square.at(3, 4))
+    board.move_piece(Square.at(7, 6), Square.at(5, 5))
+    board.move_piece(Square.at(0, 6), Square.at(2, 5))
+
+    # Assert
+    assert board.to_fen() == 'rnbqkb1r/pppppppp/5n2/8/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 2 2'
+    assert Board.from_fen(board.to_fen()).to_fen() == board.to_fen()
+
+def test_pawns_off_their_starting_rank_are_marked_as_moved():
+
+    # Act
+    board = Board.from_fen('4k3/8/8/8/8/4P3/3P4/4K3 w - - 0 1')
+
+    # Assert
+    assert not board.get_piece(Square.at(1, 3)).moved
+    assert board.get_piece(Square.at(2, 4)).moved
+    assert len(board.legal_moves()) == 2 + 1 + 4
+
+def test_pawns_placed_off_their_starting_rank_are_marked_as_moved():
+
+    # Arrange
+    board_state = [[None] * 8 for _ in range(8)]
+    board_state[6][0] = Pawn(Player.BLACK)
+    board_state[4][1] = Pawn(Player.BLACK)
+
+    # Act
+    board = Board(Player.BLACK, board_state)
+
+    # Assert
+    assert not board.get_piece(Square.at(6, 0)).moved
+    assert board.get_piece(Square.at(4, 1)).moved
+
+@pytest.mark.parametrize('board_class', [Board, BitBoard])
+def test_squares_attacked_by_each_piece_type(board_class):
+
+    # Arrange
+    board = board_class.from_fen('4k3/8/8/3b4/8/1N6/4P3/R3K3 w - - 0 1')
+
+    # Assert
+    assert board.is_attacked(Square.at(4, 2), Player.WHITE)      # knight
+    assert board.is_attacked(Square.at(2, 3), Player.WHITE)      # pawn
+    assert board.is_attacked(Square.at(1, 3), Player.WHITE)      # king
+    assert board.is_attacked(Square.at(7, 0), Player.WHITE)      # rook along the file
+    assert not board.is_attacked(Square.at(5, 5), Player.WHITE)
+    assert board.is_attacked(Square.at(2, 1), Player.BLACK)      # bishop along the diagonal
+    assert not board.is_attacked(Square.at(1, 0), Player.BLACK)  # behind the knight
+    assert not board.is_attacked(Square.at(3, 3), Player.BLACK)
+
+@pytest.mark.parametrize('board_class', [Board, BitBoard])
+def test_blocked_sliders_do_not_attack(board_class):
+
+    # Arrange
+    board = board_class.from_fen('4k3/8/8/8/8/8/P7/R3K3 w - - 0 1')
+
+    # Assert
+    assert board.is_attacked(Square.at(0, 3), Player.WHITE)
+    assert not board.is_attacked(Square.at(2, 0), Player.WHITE)
+
+def test_king_in_check_is_detected():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/8/8/8/4K2r w - - 0 1')
+
+    # Assert
+    assert board.in_check()
+    assert not board.in_check(Player.BLACK)
+
+def test_pinned_pieces_are_found():
+
+    # Arrange
+    board = Board.from_fen('4r3/8/8/b7/8/8/3N4/4K3 w - - 0 1')
+    board.set_piece(Square.at(3, 4), Rook(Player.WHITE))
+
+    # Act
+    pinned = board.pinned_pieces(Player.WHITE)
+
+    # Assert
+    assert pinned == {board.get_piece(Square.at(1, 3)), board.get_piece(Square.at(3, 4))}
+
+def test_pinned_pieces_can_only_move_along_the_pin():
+
+    # Arrange
+    board = Board.from_fen('4k3/4r3/8/8/8/8/4R3/4K3 w - - 0 1')
+
+    # Act
+    moves = board.legal_moves()
+
+    # Assert
+    rook_moves = [move for move in moves if move.from_square == Square.at(1, 4)]
+    assert sorted(move.to_square for move in rook_moves) == [Square.at(row, 4) for row in range(2, 7)]
+
+@pytest.mark.parametrize('board_class', [Board, BitBoard])
+def test_king_can_castle_on_both_sides(board_class):
+
+    # Arrange
+    board = board_class.from_fen('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+
+    # Act
+    board.make_move(Move(Square.at(0, 4), Square.at(0, 6)))
+
+    # Assert
+    assert isinstance(board.get_piece(Square.at(0, 6)), King)
+    assert isinstance(board.get_piece(Square.at(0, 5)), Rook)
+    assert board.get_piece(Square.at(0, 7)) is None
+    assert board.to_fen() == 'r3k2r/8/8/8/8/8/8/R4RK1 b kq - 1 1'
+
+def test_king_cannot_castle_through_check():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/8/8/5r2/R3K2R w KQ - 0 1')
+
+    # Act
+    destinations = {move.to_square for move in board.legal_moves() if move.from_square == Square.at(0, 4)}
+
+    # Assert
+    assert Square.at(0, 2) in destinations
+    assert Square.at(0, 6) not in destinations
+
+def test_moving_a_rook_loses_its_castling_right():
+
+    # Arrange
+    board = Board.from_fen('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+
+    # Act
+    board.make_move(Move(Square.at(0, 0), Square.at(1, 0)))
+
+    # Assert
+    assert board.to_fen().split()[2] == 'Kkq'
+
+def test_unmake_castling_restores_rights_and_key():
+
+    # Arrange
+    board = Board.from_fen('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+    fen, key = board.to_fen(), board.zobrist_key
+
+    # Act
+    board.make_move(Move(Square.at(0, 4), Square.at(0, 2)))
+    board.unmake_move()
+
+    # Assert
+    assert board.to_fen() == fen
+    assert board.zobrist_key == key
+
+@pytest.mark.parametrize('board_class', [Board, BitBoard])
+def test_pawn_can_capture_en_passant(board_class):
+
+    # Arrange
+    board = board_class.from_fen('4k3/8/8/8/4p3/8/3P4/4K3 w - - 0 1')
+    board.make_move(Move(Square.at(1, 3), Square.at(3, 3)))
+
+    # Act
+    board.make_move(Move(Square.at(3, 4), Square.at(2, 3)))
+
+    # Assert
+    assert board.get_piece(Square.at(3, 3)) is None
+    assert board.get_piece(Square.at(2, 3)).player == Player.BLACK
+    assert board.pieces(Player.WHITE, Pawn) == []
+
+def test_en_passant_square_is_written_to_fen_only_when_capturable():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/4p3/8/3P3P/4K3 w - - 0 1')
+
+    # Act
+    board.make_move(Move(Square.at(1, 3), Square.at(3, 3)))
+    capturable = board.to_fen()
+    board.unmake_move()
+    board.make_move(Move(Square.at(1, 7), Square.at(3, 7)))
+    not_capturable = board.to_fen()
+
+    # Assert
+    assert capturable.split()[3] == 'd3'
+    assert not_capturable.split()[3] == '-'
+    assert Board.from_fen(capturable).zobrist_key != Board.from_fen(capturable.replace('d3', '-')).zobrist_key
+
+def test_pawn_reaching_last_rank_has_four_promotions():
+
+    # Arrange
+    board = Board.from_fen('4k3/P7/8/8/8/8/8/4K3 w - - 0 1')
+
+    # Act
+    promotions = {move.promotion for move in board.legal_moves() if move.from_square == Square.at(6, 0)}
+
+    # Assert
+    assert len(promotions) == 4
+
+def test_moving_pawn_to_last_rank_promotes_to_queen_by_default():
+
+    # Arrange
+    board = Board.from_fen('4k3/P7/8/8/8/8/8/4K3 w - - 0 1')
+
+    # Act
+    board.move_piece(Square.at(6, 0), Square.at(7, 0))
+
+    # Assert
+    assert isinstance(board.get_piece(Square.at(7, 0)), Queen)
+    assert board.pieces(Player.WHITE, Pawn) == []
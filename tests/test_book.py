@@ -0,0 +1,88 @@
+import io
+
+import pytest
+
+from chessington.engine.board import Board
+from chessington.engine.book import BookBuilder, OpeningBook
+from chessington.engine.data import Move, Square
+from chessington.engine.search import Searcher
+
+PGN = '''1. e4 e5 2. Nf3 Nc6 1-0
+
+1. e4 c5 2. Nf3 d6 0-1
+
+1. d4 d5 2. c4 e6 1/2-1/2
+'''
+
+E4 = Move(Square.at(1, 4), Square.at(3, 4))
+D4 = Move(Square.at(1, 3), Square.at(3, 3))
+
+def build_book(path, max_ply=20, min_weight=1):
+    builder = BookBuilder(max_ply)
+    builder.add_pgn(io.StringIO(PGN))
+    builder.write(str(path), min_weight)
+    return OpeningBook(str(path))
+
+def test_book_moves_are_ordered_by_how_often_they_were_played(tmp_path):
+
+    # Arrange
+    book = build_book(tmp_path / 'book.bin')
+
+    # Act
+    entries = book.entries(Board.at_starting_position())
+
+    # Assert
+    assert entries == [(E4, 2), (D4, 1)]
+    assert book.best_move(Board.at_starting_position()) == E4
+
+def test_transposed_positions_share_book_moves(tmp_path):
+
+    # Arrange
+    book = build_book(tmp_path / 'book.bin')
+    board = Board.at_starting_position()
+    for move in (E4, Move(Square.at(6, 4), Square.at(4, 4))):
+        board.make_move(move)
+
+    # Act
+    entries = book.entries(board)
+
+    # Assert
+    assert entries == [(Move(Square.at(0, 6), Square.at(2, 5)), 1)]
+
+def test_positions_outside_the_book_have_no_moves(tmp_path):
+
+    # Arrange
+    book = build_book(tmp_path / 'book.bin', max_ply=2, min_weight=2)
+    board = Board.at_starting_position()
+    board.make_move(E4)
+
+    # Act
+    entries = book.entries(board)
+
+    # Assert
+    assert len(book) == 1
+    assert entries == []
+    assert book.choose_move(board) is None
+
+def test_searcher_plays_book_moves_without_searching(tmp_path):
+
+    # Arrange
+    searcher = Searcher(book=build_book(tmp_path / 'book.bin'))
+
+    # Act
+    result = searcher.search(Board.at_starting_position(), depth=3)
+
+    # Assert
+    assert result.move == E4
+    assert result.depth == 0
+    assert result.nodes == 0
+
+def test_files_that_are_not_books_are_rejected(tmp_path):
+
+    # Arrange
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'\0' * 64)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        OpeningBook(str(path))
@@ -0,0 +1,48 @@
+import pickle
+
+import pytest
+
+from chessington.engine.data import Player, Square
+from chessington.engine.pieces import Pawn, Queen
+
+def test_squares_on_the_board_are_interned():
+
+    # Act
+    square1 = Square.at(3, 4)
+    square2 = Square.at(3, 4)
+
+    # Assert
+    assert square1 is square2
+    assert Square.from_index(3 * 8 + 4) is square1
+
+def test_squares_off_the_board_can_still_be_created():
+
+    # Act
+    square = Square.at(8, -1)
+
+    # Assert
+    assert square == (8, -1)
+
+def test_squares_and_pieces_have_no_instance_dictionary():
+
+    # Arrange
+    square = Square.at(0, 0)
+    pieces = [Pawn(Player.WHITE), Queen(Player.BLACK)]
+
+    # Assert
+    assert not hasattr(square, '__dict__')
+    for piece in pieces:
+        assert not hasattr(piece, '__dict__')
+        with pytest.raises(AttributeError):
+            piece.colour = 'white'
+
+def test_unpickled_squares_are_interned():
+
+    # Arrange
+    square = Square.at(5, 2)
+
+    # Act
+    unpickled = pickle.loads(pickle.dumps(square))
+
+    # Assert
+    assert unpickled is square
@@ -0,0 +1,77 @@
+import pytest
+
+from chessington.engine.bitboard import BitBoard
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.encoding import (encode_position, decode_position, encode_positions, decode_positions,
+                                         encode_move, decode_move, POSITION_SIZE)
+from chessington.engine.pieces import Knight, Queen
+
+FENS = [
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1',
+    'r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w - - 4 4',
+    '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 b - - 0 37',
+    'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w Kq - 0 1',
+    'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3',
+]
+
+def test_positions_pack_into_fixed_size_records():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    data = encode_position(board)
+
+    # Assert
+    assert len(data) == POSITION_SIZE
+
+@pytest.mark.parametrize('fen', FENS)
+def test_positions_round_trip_through_packing(fen):
+
+    # Arrange
+    board = Board.from_fen(fen)
+
+    # Act
+    decoded = decode_position(encode_position(board))
+
+    # Assert
+    assert decoded.to_fen() == fen
+    assert decoded.zobrist_key == board.zobrist_key
+    assert len(decoded.legal_moves()) == len(board.legal_moves())
+
+def test_bulk_decoding_yields_each_position_in_order():
+
+    # Arrange
+    boards = [Board.from_fen(fen) for fen in FENS]
+
+    # Act
+    data = encode_positions(boards)
+    decoded = list(decode_positions(data, BitBoard))
+
+    # Assert
+    assert len(data) == len(FENS) * POSITION_SIZE
+    assert [board.to_fen() for board in decoded] == FENS
+    assert all(isinstance(board, BitBoard) for board in decoded)
+    assert decoded[2].current_player == Player.BLACK
+
+@pytest.mark.parametrize('promotion', [None, Knight, Queen])
+def test_moves_round_trip_through_encoding(promotion):
+
+    # Arrange
+    move = Move(Square.at(6, 0), Square.at(7, 1), promotion)
+
+    # Act
+    decoded = decode_move(encode_move(move))
+
+    # Assert
+    assert decoded == move
+
+def test_bulk_decoding_rejects_truncated_data():
+
+    # Arrange
+    data = encode_positions([Board.at_starting_position()])[:-1]
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        list(decode_positions(data))
@@ -0,0 +1,62 @@
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square
+from chessington.engine.evaluation import evaluate, compute_score
+from chessington.engine.pieces import Pawn, Knight, Queen, King
+
+def test_starting_position_is_level():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    score = evaluate(board)
+
+    # Assert
+    assert score == 0
+
+def test_evaluation_is_from_the_point_of_view_of_the_player_to_move():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(0, 4), King(Player.WHITE))
+    board.set_piece(Square.at(7, 4), King(Player.BLACK))
+    board.set_piece(Square.at(3, 3), Queen(Player.WHITE))
+
+    # Act
+    white_score = evaluate(board)
+    board.move_piece(Square.at(0, 4), Square.at(0, 3))
+    black_score = evaluate(board)
+
+    # Assert
+    assert white_score > 800
+    assert black_score < -800
+
+def test_incremental_score_matches_recomputed_score():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    board.move_piece(Square.at(1, 4), Square.at(3, 4))
+    board.move_piece(Square.at(6, 3), Square.at(4, 3))
+    board.move_piece(Square.at(3, 4), Square.at(4, 3))
+
+    # Assert
+    assert board.evaluation_score == compute_score(board)
+    assert board.evaluation_score > 0
+
+def test_unmake_move_restores_the_score():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(3, 3), Knight(Player.WHITE))
+    board.set_piece(Square.at(5, 4), Pawn(Player.BLACK))
+    initial_score = board.evaluation_score
+
+    # Act
+    for move in board.legal_moves():
+        board.make_move(move)
+        board.unmake_move()
+
+    # Assert
+    assert board.evaluation_score == initial_score == compute_score(board)
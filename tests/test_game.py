@@ -0,0 +1,92 @@
+from chessington.engine.board import Board
+from chessington.engine.data import Move, Square
+from chessington.engine.game import Game, WHITE_WINS, DRAW, IN_PROGRESS
+
+KNIGHT_SHUFFLE = [
+    Move(Square.at(0, 6), Square.at(2, 5)), Move(Square.at(7, 6), Square.at(5, 5)),
+    Move(Square.at(2, 5), Square.at(0, 6)), Move(Square.at(5, 5), Square.at(7, 6)),
+]
+
+def test_repeating_a_position_three_times_is_a_draw():
+
+    # Arrange
+    game = Game()
+
+    # Act
+    for move in KNIGHT_SHUFFLE * 2:
+        game.play(move)
+
+    # Assert
+    assert game.repetition_count() == 3
+    assert game.is_threefold_repetition()
+    assert game.result() == DRAW
+
+def test_undoing_a_move_forgets_its_position():
+
+    # Arrange
+    game = Game()
+    for move in KNIGHT_SHUFFLE * 2:
+        game.play(move)
+
+    # Act
+    undone = game.undo()
+
+    # Assert
+    assert undone == KNIGHT_SHUFFLE[-1]
+    assert game.repetition_count() == 2
+    assert not game.is_threefold_repetition()
+    assert game.result() == IN_PROGRESS
+
+def test_fifty_moves_without_capture_or_pawn_move_is_a_draw():
+
+    # Arrange
+    game = Game(Board.from_fen('4k3/8/8/8/8/8/8/R3K3 w - - 99 80'))
+
+    # Act
+    game.play(Move(Square.at(0, 0), Square.at(1, 0)))
+
+    # Assert
+    assert game.is_fifty_move_rule()
+    assert game.result() == DRAW
+
+def test_checkmate_ends_the_game():
+
+    # Arrange
+    game = Game(Board.from_fen('6k1/5ppp/8/8/8/8/8/K2R4 w - - 0 1'))
+
+    # Act
+    game.play(Move(Square.at(0, 3), Square.at(7, 3)))
+
+    # Assert
+    assert game.is_over()
+    assert game.result() == WHITE_WINS
+
+def test_game_is_exported_as_pgn():
+
+    # Arrange
+    game = Game()
+    for move in KNIGHT_SHUFFLE[:2]:
+        game.play(move)
+
+    # Act
+    pgn = game.to_pgn({'White': 'Alice', 'Black': 'Bob'})
+
+    # Assert
+    assert pgn.startswith('[Event "?"]\n')
+    assert '[White "Alice"]\n[Black "Bob"]\n[Result "*"]\n' in pgn
+    assert pgn.endswith('\n\n1. Nf3 Nf6 *\n')
+
+def test_pgn_from_a_set_up_position_records_the_fen():
+
+    # Arrange
+    fen = '6k1/5ppp/8/8/8/8/8/K2R4 b - - 0 40'
+    game = Game(Board.from_fen(fen))
+
+    # Act
+    game.play(Move(Square.at(7, 6), Square.at(7, 7)))
+    game.play(Move(Square.at(0, 3), Square.at(7, 3)))
+    pgn = game.to_pgn()
+
+    # Assert
+    assert '[FEN "{}"]'.format(fen) in pgn
+    assert pgn.endswith('40... Kh8 41. Rd8# 1-0\n')
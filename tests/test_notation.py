@@ -0,0 +1,63 @@
+from chessington.engine.board import Board
+from chessington.engine.data import Move, Square
+from chessington.engine.notation import move_to_san
+from chessington.engine.pieces import Knight, Queen
+
+def test_pawn_and_piece_moves_are_written_in_san():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    pawn_move = move_to_san(board, Move(Square.at(1, 4), Square.at(3, 4)))
+    knight_move = move_to_san(board, Move(Square.at(0, 6), Square.at(2, 5)))
+
+    # Assert
+    assert pawn_move == 'e4'
+    assert knight_move == 'Nf3'
+
+def test_captures_and_castling_are_written_in_san():
+
+    # Arrange
+    board = Board.from_fen('r3k2r/8/8/3p4/4P3/8/8/R3K2R w KQkq - 0 1')
+
+    # Act
+    capture = move_to_san(board, Move(Square.at(3, 4), Square.at(4, 3)))
+    kingside = move_to_san(board, Move(Square.at(0, 4), Square.at(0, 6)))
+    queenside = move_to_san(board, Move(Square.at(0, 4), Square.at(0, 2)))
+
+    # Assert
+    assert capture == 'exd5'
+    assert kingside == 'O-O'
+    assert queenside == 'O-O-O'
+
+def test_ambiguous_moves_are_disambiguated_by_file_then_rank():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/8/R7/4K3/R6R w - - 0 1')
+
+    # Act
+    by_file = move_to_san(board, Move(Square.at(0, 7), Square.at(0, 5)))
+    by_rank = move_to_san(board, Move(Square.at(0, 0), Square.at(1, 0)))
+
+    # Assert
+    assert by_file == 'Rhf1'
+    assert by_rank == 'R1a2'
+
+def test_promotions_checks_and_mates_are_marked():
+
+    # Arrange
+    board = Board.from_fen('6k1/P4ppp/8/8/8/8/8/K2R4 w - - 0 1')
+    open_board = Board.from_fen('4k3/8/8/8/8/8/8/K2R4 w - - 0 1')
+
+    # Act
+    promotion = move_to_san(board, Move(Square.at(6, 0), Square.at(7, 0), Knight))
+    mating_promotion = move_to_san(board, Move(Square.at(6, 0), Square.at(7, 0), Queen))
+    check = move_to_san(open_board, Move(Square.at(0, 3), Square.at(0, 4)))
+    mate = move_to_san(board, Move(Square.at(0, 3), Square.at(7, 3)))
+
+    # Assert
+    assert promotion == 'a8=N'
+    assert mating_promotion == 'a8=Q#'
+    assert check == 'Re1+'
+    assert mate == 'Rd8#'
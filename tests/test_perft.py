@@ -0,0 +1,61 @@
+import pytest
+
+from chessington.engine.bitboard import BitBoard
+from chessington.engine.board import Board
+from chessington.engine.perft import perft, divide, run_benchmark, PERFT_POSITIONS
+
+
+def test_perft_from_starting_position_matches_reference_counts():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    counts = [perft(board, depth) for depth in range(1, 4)]
+
+    # Assert
+    assert counts == [20, 400, 8902]
+
+def test_perft_on_bitboard_matches_reference_counts():
+
+    # Arrange
+    board = BitBoard.at_starting_position()
+
+    # Act
+    nodes = perft(board, 3)
+
+    # Assert
+    assert nodes == 8902
+
+@pytest.mark.parametrize('position', PERFT_POSITIONS[1:], ids=lambda position: position.name)
+@pytest.mark.parametrize('board_class', [Board, BitBoard])
+def test_perft_with_castling_en_passant_and_promotion(position, board_class):
+
+    # Arrange
+    board = board_class.from_fen(position.fen)
+
+    # Act
+    nodes = perft(board, 2)
+
+    # Assert
+    assert nodes == position.expected[2]
+
+def test_divide_sums_to_perft():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    counts = divide(board, 2)
+
+    # Assert
+    assert len(counts) == 20
+    assert sum(counts.values()) == 400
+
+def test_benchmark_reports_no_failures():
+
+    # Act
+    results = run_benchmark(2, report=lambda line: None)
+
+    # Assert
+    assert all(result.nodes == result.expected for result in results)
@@ -0,0 +1,115 @@
+import io
+
+import pytest
+
+from chessington.engine.data import Move, Square
+from chessington.engine.game import Game
+from chessington.engine.pgn import read_games, read_positions, map_games, split_games
+from chessington.engine.pieces import Queen
+
+PGN = '''[Event "Casual game"]
+[White "Alice"]
+[Black "Bob"]
+[Result "1-0"]
+
+1. e4 e5 2. Bc4 {attacking f7} Nc6 3. Qh5 Nf6?? (3... g6 4. Qf3) 4. Qxf7# 1-0
+
+[Event "Promotion"]
+[FEN "4k3/P7/8/8/8/8/8/4K3 w - - 0 1"]
+[SetUp "1"]
+
+1. a8=Q+ $1 Kd7 ; a comment to the end of the line
+2. Qb7+ *
+'''
+
+def count_moves(game):
+    return len(game.moves)
+
+def write_games(path, copies):
+    path.write_text(PGN * copies)
+    return str(path)
+
+def test_games_are_read_with_tags_moves_and_results():
+
+    # Act
+    games = list(read_games(io.StringIO(PGN)))
+
+    # Assert
+    assert len(games) == 2
+    assert games[0].tags['White'] == 'Alice'
+    assert games[0].moves == ['e4', 'e5', 'Bc4', 'Nc6', 'Qh5', 'Nf6??', 'Qxf7#']
+    assert games[0].result == '1-0'
+    assert games[1].moves == ['a8=Q+', 'Kd7', 'Qb7+']
+    assert games[1].result == '*'
+
+def test_replaying_a_game_resolves_each_san_move():
+
+    # Arrange
+    game = next(read_games(io.StringIO(PGN)))
+
+    # Act
+    moves = [move for board, move in game.replay()]
+
+    # Assert
+    assert moves[0] == Move(Square.at(1, 4), Square.at(3, 4))
+    assert moves[-1] == Move(Square.at(4, 7), Square.at(6, 5))
+
+def test_positions_are_replayed_from_the_fen_tag():
+
+    # Act
+    positions = [(board.to_fen(), move) for game, board, move in read_positions(io.StringIO(PGN))]
+
+    # Assert
+    assert len(positions) == 10
+    assert positions[7] == ('4k3/P7/8/8/8/8/8/4K3 w - - 0 1', Move(Square.at(6, 0), Square.at(7, 0), Queen))
+
+def test_illegal_moves_are_rejected():
+
+    # Arrange
+    game = next(read_games(io.StringIO('1. e4 e5 2. Ke3 *')))
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        list(game.replay())
+
+def test_exported_games_read_back_the_same(tmp_path):
+
+    # Arrange
+    game = Game()
+    for board, move in next(read_games(io.StringIO(PGN))).replay():
+        game.play(move)
+    path = tmp_path / 'game.pgn'
+    path.write_text(game.to_pgn())
+
+    # Act
+    read_back = next(read_games(path))
+
+    # Assert
+    assert read_back.moves == game.san_moves()
+    assert read_back.result == '1-0'
+
+def test_file_is_split_at_game_boundaries(tmp_path):
+
+    # Arrange
+    path = write_games(tmp_path / 'games.pgn', 10)
+
+    # Act
+    ranges = split_games(path, 4)
+
+    # Assert
+    with open(path, 'rb') as file:
+        data = file.read()
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    assert all(data[start:start + 7] == b'[Event ' for start, _ in ranges)
+
+def test_games_are_mapped_across_processes_in_file_order(tmp_path):
+
+    # Arrange
+    path = write_games(tmp_path / 'games.pgn', 25)
+
+    # Act
+    counts = list(map_games(path, count_moves, processes=2, chunk_bytes=1000))
+
+    # Assert
+    assert counts == [7, 3] * 25
@@ -1,6 +1,6 @@
 from chessington.engine.board import Board
 from chessington.engine.data import Player, Square
-from chessington.engine.pieces import Pawn, Knight
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
 
 class TestPawns:
 
@@ -394,4 +394,161 @@ class TestKnight:
         moves = knight.get_available_moves(board)
 
         # Assert
-        assert enemy_square in moves
\ No newline at end of file
+        assert enemy_square in moves
+
+    @staticmethod
+    def test_knight_cannot_capture_friendly_piece():
+        # Arrange
+        board = Board.empty()
+        knight = Knight(Player.WHITE)
+        square = Square.at(0, 1)
+        board.set_piece(square, knight)
+
+        friendly = Pawn(Player.WHITE)
+        friendly_square = Square.at(2, 2)
+        board.set_piece(friendly_square, friendly)
+
+        # Act
+        moves = knight.get_available_moves(board)
+
+        # Assert
+        assert friendly_square not in moves
+        assert sorted(moves) == [Square.at(1, 3), Square.at(2, 0)]
+
+class TestKing:
+
+    @staticmethod
+    def test_king_can_move_to_all_adjacent_squares():
+        # Arrange
+        board = Board.empty()
+        king = King(Player.WHITE)
+        square = Square.at(3, 3)
+        board.set_piece(square, king)
+
+        # Act
+        moves = king.get_available_moves(board)
+
+        # Assert
+        assert len(moves) == 8
+
+    @staticmethod
+    def test_king_cannot_leave_the_board():
+        # Arrange
+        board = Board.empty()
+        king = King(Player.BLACK)
+        square = Square.at(7, 0)
+        board.set_piece(square, king)
+
+        # Act
+        moves = king.get_available_moves(board)
+
+        # Assert
+        assert sorted(moves) == [Square.at(6, 0), Square.at(6, 1), Square.at(7, 1)]
+
+    @staticmethod
+    def test_king_can_capture_enemy_but_not_friendly_pieces():
+        # Arrange
+        board = Board.empty()
+        king = King(Player.WHITE)
+        board.set_piece(Square.at(0, 4), king)
+        board.set_piece(Square.at(1, 4), Pawn(Player.WHITE))
+        board.set_piece(Square.at(1, 5), Pawn(Player.BLACK))
+
+        # Act
+        moves = king.get_available_moves(board)
+
+        # Assert
+        assert Square.at(1, 4) not in moves
+        assert Square.at(1, 5) in moves
+
+class TestBishop:
+
+    @staticmethod
+    def test_bishop_moves_diagonally_to_the_edge_of_the_board():
+        # Arrange
+        board = Board.empty()
+        bishop = Bishop(Player.WHITE)
+        board.set_piece(Square.at(0, 2), bishop)
+
+        # Act
+        moves = bishop.get_available_moves(board)
+
+        # Assert
+        assert sorted(moves) == [Square.at(1, 1), Square.at(1, 3), Square.at(2, 0), Square.at(2, 4),
+                                 Square.at(3, 5), Square.at(4, 6), Square.at(5, 7)]
+
+    @staticmethod
+    def test_bishop_stops_at_friendly_piece_and_captures_enemy():
+        # Arrange
+        board = Board.empty()
+        bishop = Bishop(Player.BLACK)
+        board.set_piece(Square.at(4, 4), bishop)
+        board.set_piece(Square.at(6, 6), Pawn(Player.BLACK))
+        board.set_piece(Square.at(2, 2), Pawn(Player.WHITE))
+
+        # Act
+        moves = bishop.get_available_moves(board)
+
+        # Assert
+        assert Square.at(5, 5) in moves
+        assert Square.at(6, 6) not in moves
+        assert Square.at(2, 2) in moves
+        assert Square.at(1, 1) not in moves
+
+class TestRook:
+
+    @staticmethod
+    def test_rook_moves_along_rank_and_file():
+        # Arrange
+        board = Board.empty()
+        rook = Rook(Player.WHITE)
+        board.set_piece(Square.at(3, 3), rook)
+
+        # Act
+        moves = rook.get_available_moves(board)
+
+        # Assert
+        assert len(moves) == 14
+        assert all(square.row == 3 or square.col == 3 for square in moves)
+
+    @staticmethod
+    def test_rook_cannot_move_past_blocking_pieces():
+        # Arrange
+        board = Board.empty()
+        rook = Rook(Player.WHITE)
+        board.set_piece(Square.at(0, 0), rook)
+        board.set_piece(Square.at(0, 1), Knight(Player.WHITE))
+        board.set_piece(Square.at(2, 0), Pawn(Player.BLACK))
+
+        # Act
+        moves = rook.get_available_moves(board)
+
+        # Assert
+        assert sorted(moves) == [Square.at(1, 0), Square.at(2, 0)]
+
+class TestQueen:
+
+    @staticmethod
+    def test_queen_combines_rook_and_bishop_moves():
+        # Arrange
+        board = Board.empty()
+        queen = Queen(Player.WHITE)
+        board.set_piece(Square.at(3, 3), queen)
+
+        # Act
+        moves = queen.get_available_moves(board)
+
+        # Assert
+        assert len(moves) == 27
+
+    @staticmethod
+    def test_queen_has_no_moves_in_starting_position():
+        # Arrange
+        board = Board.at_starting_position()
+        queen = board.get_piece(Square.at(0, 3))
+
+        # Act
+        moves = queen.get_available_moves(board)
+
+        # Assert
+        assert moves == []
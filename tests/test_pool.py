@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+from chessington.engine.pool import map_bounded, TASKS_IN_FLIGHT_PER_PROCESS
+
+def square(value):
+    return value * value
+
+def test_results_are_yielded_in_order():
+
+    # Act
+    with ThreadPoolExecutor(2) as executor:
+        results = list(map_bounded(executor, square, ((value,) for value in range(10)), 2))
+
+    # Assert
+    assert results == [value * value for value in range(10)]
+
+def test_unordered_results_cover_every_task():
+
+    # Act
+    with ThreadPoolExecutor(3) as executor:
+        results = list(map_bounded(executor, square, ((value,) for value in range(10)), 3, ordered=False))
+
+    # Assert
+    assert sorted(results) == [value * value for value in range(10)]
+
+def test_only_a_bounded_number_of_tasks_are_submitted_ahead():
+
+    # Arrange
+    taken = []
+    arguments = ((taken.append(value) or value,) for value in count())
+
+    # Act
+    with ThreadPoolExecutor(2) as executor:
+        results = map_bounded(executor, square, arguments, 2)
+        first = next(results)
+
+    # Assert
+    assert first == 0
+    assert len(taken) == 2 * TASKS_IN_FLIGHT_PER_PROCESS + 1
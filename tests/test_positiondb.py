@@ -0,0 +1,124 @@
+import pytest
+
+from chessington.engine.board import Board
+from chessington.engine.data import Move, Square
+from chessington.engine import positiondb
+from chessington.engine.positiondb import PositionDatabase, AnalysisRecord
+
+FENS = [
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1',
+    'r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w - - 4 4',
+    '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 b - - 0 37',
+]
+
+def test_positions_are_decoded_on_demand(tmp_path):
+
+    # Arrange
+    path = tmp_path / 'positions.db'
+    PositionDatabase.create(path, [Board.from_fen(fen) for fen in FENS]).close()
+
+    # Act
+    with PositionDatabase(path) as database:
+        fens = [board.to_fen() for board in database]
+        last = database[-1]
+
+    # Assert
+    assert fens == FENS
+    assert last.to_fen() == FENS[-1]
+
+def test_positions_can_be_appended(tmp_path):
+
+    # Arrange
+    path = tmp_path / 'positions.db'
+    database = PositionDatabase.create(path, [Board.from_fen(FENS[0])])
+
+    # Act
+    database.extend(Board.from_fen(fen) for fen in FENS[1:])
+    database.close()
+
+    # Assert
+    with PositionDatabase(path) as database:
+        assert len(database) == len(FENS)
+        assert database[1].to_fen() == FENS[1]
+
+def test_positions_are_appended_in_batches(tmp_path, monkeypatch):
+
+    # Arrange
+    monkeypatch.setattr(positiondb, '_EXTEND_BATCH_SIZE', 2)
+    path = tmp_path / 'positions.db'
+    database = PositionDatabase.create(path)
+
+    # Act
+    database.extend(Board.from_fen(fen) for fen in FENS * 3)
+    database.close()
+
+    # Assert
+    with PositionDatabase(path) as database:
+        assert [board.to_fen() for board in database] == FENS * 3
+
+def test_positions_can_be_appended_while_a_view_is_held(tmp_path):
+
+    # Arrange
+    path = tmp_path / 'positions.db'
+    database = PositionDatabase.create(path, [Board.from_fen(FENS[0])])
+    view = database.position_bytes(0)
+    packed = bytes(view)
+
+    # Act
+    database.append(Board.from_fen(FENS[1]))
+    database.close()
+
+    # Assert
+    assert bytes(view) == packed
+    view.release()
+    with PositionDatabase(path) as database:
+        assert [board.to_fen() for board in database] == FENS[:2]
+
+def test_slices_decode_each_position(tmp_path):
+
+    # Arrange
+    path = tmp_path / 'positions.db'
+
+    # Act / Assert
+    with PositionDatabase.create(path, [Board.from_fen(fen) for fen in FENS]) as database:
+        assert [board.to_fen() for board in database[1:]] == FENS[1:]
+        with pytest.raises(TypeError):
+            database['0']
+
+def test_results_are_stored_alongside_positions(tmp_path):
+
+    # Arrange
+    path = tmp_path / 'positions.db'
+    move = Move(Square.at(0, 6), Square.at(2, 5))
+    with PositionDatabase.create(path, [Board.from_fen(fen) for fen in FENS]) as database:
+
+        # Act
+        database.set_result(1, move, -35, 6)
+
+    # Assert
+    with PositionDatabase(path) as database:
+        assert database.get_result(0) is None
+        assert database.get_result(1) == AnalysisRecord(move, -35, 6)
+
+def test_read_only_database_cannot_be_modified(tmp_path):
+
+    # Arrange
+    path = tmp_path / 'positions.db'
+    PositionDatabase.create(path, [Board.at_starting_position()]).close()
+
+    # Act / Assert
+    with PositionDatabase(path) as database:
+        with pytest.raises(ValueError):
+            database.set_result(0, None, 0, 1)
+        with pytest.raises(IndexError):
+            database[1]
+
+def test_other_files_are_rejected(tmp_path):
+
+    # Arrange
+    path = tmp_path / 'not-positions.db'
+    path.write_bytes(b'x' * 64)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        PositionDatabase(path)
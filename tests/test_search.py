@@ -0,0 +1,118 @@
+import threading
+
+from chessington.engine.board import Board
+from chessington.engine.data import Move, Player, Square
+from chessington.engine.pieces import Pawn, Knight, Rook, Queen, King
+from chessington.engine.search import Searcher, search, MATE_SCORE
+from chessington.engine.transposition import SharedTranspositionTable
+from chessington.engine.zobrist import compute_key
+
+def test_search_finds_mate_in_one():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(0, 6), King(Player.WHITE))
+    board.set_piece(Square.at(0, 0), Rook(Player.WHITE))
+    board.set_piece(Square.at(7, 6), King(Player.BLACK))
+    for col in (5, 6, 7):
+        board.set_piece(Square.at(6, col), Pawn(Player.BLACK))
+
+    # Act
+    result = search(board, depth=3)
+
+    # Assert
+    assert result.move == Move(Square.at(0, 0), Square.at(7, 0))
+    assert result.score == MATE_SCORE - 1
+
+def test_search_captures_undefended_queen():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(0, 4), King(Player.WHITE))
+    board.set_piece(Square.at(2, 2), Knight(Player.WHITE))
+    board.set_piece(Square.at(7, 4), King(Player.BLACK))
+    board.set_piece(Square.at(4, 3), Queen(Player.BLACK))
+
+    # Act
+    result = search(board, depth=2)
+
+    # Assert
+    assert result.move == Move(Square.at(2, 2), Square.at(4, 3))
+
+def test_search_leaves_the_board_unchanged():
+
+    # Arrange
+    board = Board.at_starting_position()
+    key = board.zobrist_key
+
+    # Act
+    search(board, depth=3)
+
+    # Assert
+    assert board.zobrist_key == key == compute_key(board)
+    assert board.current_player == Player.WHITE
+
+def test_node_limit_stops_the_search():
+
+    # Arrange
+    board = Board.at_starting_position()
+    searcher = Searcher(megabytes=1)
+
+    # Act
+    result = searcher.search(board, node_limit=500)
+
+    # Assert
+    assert result.move in board.legal_moves()
+    assert result.nodes <= 501
+
+def test_stop_before_the_search_applies_to_it_and_not_the_next():
+
+    # Arrange
+    board = Board.at_starting_position()
+    searcher = Searcher(megabytes=1)
+    stop_event = threading.Event()
+
+    # Act
+    stop_event.set()
+    stopped = searcher.search(board, depth=4, stop_event=stop_event)
+    searcher.stop()
+    result = searcher.search(board, depth=4)
+
+    # Assert
+    assert stopped.depth < 4
+    assert result.depth == 4
+
+def test_info_is_reported_for_each_iteration():
+
+    # Arrange
+    board = Board.at_starting_position()
+    depths = []
+
+    # Act
+    search(board, depth=3, info=lambda result: depths.append(result.depth))
+
+    # Assert
+    assert depths == [1, 2, 3]
+
+def test_parallel_search_finds_mate_in_one():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(0, 6), King(Player.WHITE))
+    board.set_piece(Square.at(0, 0), Rook(Player.WHITE))
+    board.set_piece(Square.at(7, 6), King(Player.BLACK))
+    for col in (5, 6, 7):
+        board.set_piece(Square.at(6, col), Pawn(Player.BLACK))
+    searcher = Searcher(megabytes=1)
+
+    # Act
+    result = searcher.search(board, depth=3, processes=3)
+    table = searcher.table
+    searcher.search(board, depth=3, processes=3)
+    searcher.close()
+
+    # Assert
+    assert result.move == Move(Square.at(0, 0), Square.at(7, 0))
+    assert result.score == MATE_SCORE - 1
+    assert isinstance(table, SharedTranspositionTable)
+    assert not isinstance(searcher.table, SharedTranspositionTable)
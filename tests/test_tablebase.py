@@ -0,0 +1,91 @@
+import pytest
+
+from chessington.engine.board import Board
+from chessington.engine.data import Move, Square
+from chessington.engine.search import Searcher, MATE_SCORE
+from chessington.engine.tablebase import Tablebases, TablebaseResult, WIN, DRAW, LOSS
+
+@pytest.fixture(scope='module')
+def tablebases():
+    return Tablebases.generate()
+
+def test_longest_mates_match_known_values(tablebases):
+
+    # Act
+    longest = {piece_type: max(value for value in table.data if value != 0xFF) - 1
+               for piece_type, table in tablebases.tables.items()}
+
+    # Assert
+    assert sorted(longest.values()) == [20, 32, 56]
+
+def test_checkmates_and_mates_in_one_are_found(tablebases):
+
+    # Arrange
+    mated = Board.from_fen('k1Q5/8/1K6/8/8/8/8/8 b - - 0 1')
+    mate_in_one = Board.from_fen('k7/8/1K6/8/8/8/8/2R5 w - - 0 1')
+
+    # Assert
+    assert tablebases.probe(mated) == TablebaseResult(LOSS, 0)
+    assert tablebases.probe(mate_in_one) == TablebaseResult(WIN, 1)
+
+def test_positions_with_the_extra_piece_for_black_are_mirrored(tablebases):
+
+    # Arrange
+    white = Board.from_fen('4k3/8/4K3/4P3/8/8/8/8 w - - 0 1')
+    black = Board.from_fen('8/8/8/8/4p3/4k3/8/4K3 b - - 0 1')
+
+    # Assert
+    assert tablebases.probe(white).outcome == WIN
+    assert tablebases.probe(black) == tablebases.probe(white)
+
+def test_rook_pawn_against_cornered_king_is_a_draw(tablebases):
+
+    # Arrange
+    board = Board.from_fen('k7/8/K7/P7/8/8/8/8 w - - 0 1')
+
+    # Assert
+    assert tablebases.probe(board) == TablebaseResult(DRAW, 0)
+
+def test_positions_outside_the_tables_are_not_covered(tablebases):
+
+    # Assert
+    assert tablebases.probe(Board.at_starting_position()) is None
+
+def test_tables_round_trip_through_files(tablebases, tmp_path):
+
+    # Arrange
+    tablebases.save(str(tmp_path))
+
+    # Act
+    loaded = Tablebases.load(str(tmp_path))
+
+    # Assert
+    assert {piece_type: table.data for piece_type, table in loaded.tables.items()} == \
+           {piece_type: table.data for piece_type, table in tablebases.tables.items()}
+
+def test_searcher_plays_the_fastest_mate_from_the_tables(tablebases):
+
+    # Arrange
+    searcher = Searcher(tablebases=tablebases)
+    board = Board.from_fen('k7/8/1K6/8/8/8/8/2R5 w - - 0 1')
+
+    # Act
+    result = searcher.search(board, depth=4)
+
+    # Assert
+    assert result.move == Move(Square.at(0, 2), Square.at(7, 2))
+    assert result.score == MATE_SCORE - 1
+
+def test_root_outside_the_tables_is_searched_even_if_every_move_leads_into_them(tablebases):
+
+    # Arrange
+    searcher = Searcher(tablebases=tablebases)
+    board = Board.from_fen('k6r/1Q6/8/8/8/8/8/7K b - - 0 1')
+
+    # Act
+    result = searcher.search(board, depth=2)
+
+    # Assert
+    assert result.move == Move(Square.at(7, 0), Square.at(6, 1))
+    assert result.depth >= 1
+    assert result.score > MATE_SCORE - 100
@@ -0,0 +1,122 @@
+import multiprocessing
+
+from chessington.engine.data import Move, Square
+from chessington.engine.encoding import encode_move, decode_move, NO_MOVE
+from chessington.engine.transposition import (TranspositionTable, SharedTranspositionTable, EXACT, LOWER_BOUND,
+                                               UPPER_BOUND)
+
+def test_moves_survive_encoding():
+
+    # Arrange
+    move = Move(Square.at(1, 4), Square.at(3, 4))
+
+    # Act
+    code = encode_move(move)
+
+    # Assert
+    assert 0 < code < 1 << 16
+    assert decode_move(code) == move
+    assert decode_move(encode_move(None)) is None
+    assert encode_move(None) == NO_MOVE
+
+def test_table_size_is_bounded_by_megabyte_budget():
+
+    # Act
+    table = TranspositionTable(megabytes=1)
+
+    # Assert
+    assert table.size * 16 <= 1024 * 1024
+    assert table.size * 16 * 2 > 1024 * 1024
+
+def test_stored_entries_can_be_probed():
+
+    # Arrange
+    table = TranspositionTable(megabytes=1)
+    move = Move(Square.at(0, 6), Square.at(2, 5))
+
+    # Act
+    table.store(0x123456789ABCDEF0, 5, -250, LOWER_BOUND, move)
+    entry = table.probe(0x123456789ABCDEF0)
+
+    # Assert
+    assert entry.depth == 5
+    assert entry.score == -250
+    assert entry.bound == LOWER_BOUND
+    assert entry.move == move
+    assert table.probe(0x0FEDCBA987654321) is None
+
+def test_deeper_entries_are_kept_when_shallower_ones_collide():
+
+    # Arrange
+    table = TranspositionTable(megabytes=1)
+    deep_key = 7
+    shallow_key = 7 + (1 << 40)
+
+    # Act
+    table.store(deep_key, 8, 10, EXACT, None)
+    table.store(shallow_key, 2, 20, UPPER_BOUND, None)
+
+    # Assert
+    assert table.probe(deep_key).depth == 8
+    assert table.probe(shallow_key).depth == 2
+
+def test_entries_from_old_searches_are_replaced():
+
+    # Arrange
+    table = TranspositionTable(megabytes=1)
+    old_key = 7
+    new_key = 7 + (1 << 40)
+    table.store(old_key, 8, 10, EXACT, None)
+
+    # Act
+    table.new_search()
+    table.store(new_key, 2, 20, EXACT, None)
+
+    # Assert
+    assert table.probe(new_key).depth == 2
+    assert table.probe(old_key) is None
+
+def test_clear_empties_the_table():
+
+    # Arrange
+    table = TranspositionTable(megabytes=1)
+    table.store(42, 3, 0, EXACT, None)
+
+    # Act
+    table.clear()
+
+    # Assert
+    assert table.probe(42) is None
+
+def _store_in_child(table):
+    table.store(99, 4, 321, EXACT, Move(Square.at(1, 4), Square.at(3, 4)))
+    table.close()
+
+def test_shared_table_entries_are_visible_across_processes():
+
+    # Arrange
+    table = SharedTranspositionTable(megabytes=1)
+    process = multiprocessing.Process(target=_store_in_child, args=(table,))
+
+    # Act
+    process.start()
+    process.join()
+    entry = table.probe(99)
+    table.close()
+
+    # Assert
+    assert process.exitcode == 0
+    assert entry == (4, 321, EXACT, Move(Square.at(1, 4), Square.at(3, 4)))
+
+def test_torn_entries_are_rejected():
+
+    # Arrange
+    table = TranspositionTable(megabytes=1)
+    table.store(42, 3, 0, EXACT, None)
+    data_word = (42 & table._bucket_mask) * 4 + 1
+
+    # Act
+    table._words[data_word] ^= 1 << 40
+
+    # Assert
+    assert table.probe(42) is None
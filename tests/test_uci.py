@@ -0,0 +1,81 @@
+import io
+
+from chessington.engine.board import Board
+from chessington.engine.data import Move, Square
+from chessington.engine.pieces import Queen
+from chessington.engine.uci import UciEngine, format_move, parse_move, time_limit
+
+def search_position(*commands):
+    output = io.StringIO()
+    engine = UciEngine(output)
+    for command in commands:
+        engine.handle(command)
+    engine.wait()
+    return output.getvalue().splitlines()
+
+def run_commands(*commands):
+    output = io.StringIO()
+    UciEngine(output).run(io.StringIO(''.join(command + '\n' for command in commands)))
+    return output.getvalue().splitlines()
+
+def test_handshake_lists_options_and_ends_with_uciok():
+
+    # Act
+    lines = run_commands('uci', 'isready', 'quit')
+
+    # Assert
+    assert lines[0].startswith('id name ')
+    assert any(line.startswith('option name Hash ') for line in lines)
+    assert lines[-2:] == ['uciok', 'readyok']
+
+def test_moves_are_written_and_read_in_long_algebraic_notation():
+
+    # Arrange
+    board = Board.from_fen('4k3/P7/8/8/8/8/8/4K3 w - - 0 1')
+
+    # Act
+    move = parse_move(board, 'a7a8q')
+
+    # Assert
+    assert move == Move(Square.at(6, 0), Square.at(7, 0), Queen)
+    assert format_move(move) == 'a7a8q'
+
+def test_go_with_depth_reports_info_and_best_move():
+
+    # Act
+    lines = search_position('position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1', 'go depth 3')
+
+    # Assert
+    info = [line for line in lines if line.startswith('info depth')]
+    assert all(' nps ' in line for line in info)
+    assert 'score mate 1' in info[-1]
+    assert lines[-1] == 'bestmove a1a8'
+
+def test_position_moves_are_played_from_the_start():
+
+    # Act
+    lines = search_position('position startpos moves e2e4 e7e5 g1f3 b8c6 f1b5 a7a6', 'go depth 2')
+
+    # Assert
+    assert lines[-1].startswith('bestmove b5')
+
+def test_infinite_search_waits_for_stop():
+
+    # Act
+    lines = run_commands('position startpos', 'go infinite', 'stop', 'quit')
+
+    # Assert
+    assert lines[-1].startswith('bestmove ')
+
+def test_time_is_shared_out_over_the_remaining_moves():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    limit = time_limit(board, {'wtime': 60000, 'btime': 1000, 'winc': 1000, 'movestogo': 20})
+
+    # Assert
+    assert limit == (60000 / 20 + 800) / 1000
+    assert time_limit(board, {'movetime': 1050}) == 1.0
+    assert time_limit(board, {}) is None
@@ -0,0 +1,60 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+from chessington.engine.tables import square_index
+from chessington.engine.vectorized import (boards_to_array, array_to_boards, pseudo_legal_move_masks,
+                                           pseudo_legal_move_counts)
+
+FENS = [
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1',
+    'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b - - 0 1',
+    'r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w - - 4 4',
+    'r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b - - 4 4',
+    '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+    '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 b - - 0 1',
+    '4k3/8/8/3q4/8/2N5/8/4K3 w - - 0 1',
+]
+
+def test_move_counts_match_the_board_move_generator():
+
+    # Arrange
+    boards = [Board.from_fen(fen) for fen in FENS]
+    positions, white_to_move = boards_to_array(boards)
+
+    # Act
+    counts = pseudo_legal_move_counts(positions, white_to_move)
+
+    # Assert
+    assert counts.tolist() == [len(board.pseudo_legal_moves()) for board in boards]
+
+def test_move_masks_match_piece_moves():
+
+    # Arrange
+    board = Board.from_fen(FENS[3])
+    positions, white_to_move = boards_to_array([board])
+
+    # Act
+    masks = pseudo_legal_move_masks(positions, white_to_move)
+
+    # Assert
+    for piece in board.pieces(board.current_player):
+        square = board.find_piece(piece)
+        expected = sum(1 << square_index(move) for move in piece.get_available_moves(board))
+        assert int(masks[0, square_index(square)]) == expected
+
+def test_boards_round_trip_through_arrays():
+
+    # Arrange
+    boards = [Board.from_fen(fen) for fen in FENS]
+
+    # Act
+    positions, white_to_move = boards_to_array(boards)
+    converted = array_to_boards(positions, white_to_move)
+
+    # Assert
+    assert positions.shape == (len(FENS), 64)
+    assert [board.zobrist_key for board in converted] == [board.zobrist_key for board in boards]
+    assert converted[1].get_piece(Square.at(3, 4)).moved
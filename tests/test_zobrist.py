@@ -0,0 +1,63 @@
+from chessington.engine.bitboard import BitBoard
+from chessington.engine.board import Board
+from chessington.engine.data import Move, Square
+from chessington.engine.zobrist import compute_key
+
+def test_incremental_key_matches_recomputed_key_after_moves():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    board.move_piece(Square.at(1, 4), Square.at(3, 4))
+    board.move_piece(Square.at(6, 3), Square.at(4, 3))
+    board.move_piece(Square.at(3, 4), Square.at(4, 3))
+
+    # Assert
+    assert board.zobrist_key == compute_key(board)
+
+def test_transposed_move_orders_give_the_same_key():
+
+    # Arrange
+    board1 = Board.at_starting_position()
+    board2 = Board.at_starting_position()
+
+    # Act
+    board1.move_piece(Square.at(0, 1), Square.at(2, 2))
+    board1.move_piece(Square.at(7, 1), Square.at(5, 2))
+    board1.move_piece(Square.at(0, 6), Square.at(2, 5))
+    board2.move_piece(Square.at(0, 6), Square.at(2, 5))
+    board2.move_piece(Square.at(7, 1), Square.at(5, 2))
+    board2.move_piece(Square.at(0, 1), Square.at(2, 2))
+
+    # Assert
+    assert board1.zobrist_key == board2.zobrist_key
+
+def test_side_to_move_changes_the_key():
+
+    # Arrange
+    board = Board.at_starting_position()
+    initial_key = board.zobrist_key
+
+    # Act
+    board.move_piece(Square.at(0, 1), Square.at(2, 2))
+    board.move_piece(Square.at(7, 1), Square.at(5, 2))
+    board.move_piece(Square.at(2, 2), Square.at(0, 1))
+
+    # Assert
+    assert board.zobrist_key != initial_key
+
+def test_unmake_move_restores_the_key():
+
+    # Arrange
+    board = BitBoard.at_starting_position()
+    initial_key = board.zobrist_key
+
+    # Act
+    for move in board.legal_moves():
+        board.make_move(move)
+        board.unmake_move()
+
+    # Assert
+    assert board.zobrist_key == initial_key
+    assert board.zobrist_key == compute_key(board)